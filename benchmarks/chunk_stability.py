@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""Measure how many chunks survive a local edit for each chunking strategy.
+
+The stability ratio is the share of chunks of the edited document that already
+existed in the original one, i.e. the hit rate of a chunk-keyed summary cache.
+
+    python -m benchmarks.chunk_stability
+"""
+import copy
+import random
+import statistics
+import textwrap
+from typing import Callable, List
+
+from langchain.text_splitter import RecursiveCharacterTextSplitter
+
+from src.processors.chunking import ContentDefinedChunker
+
+WORDS = (
+    "revenue margin contract party clause liability asset quarter report "
+    "growth risk market model customer product service data policy term "
+    "agreement payment delivery notice period value the of and to in for"
+).split()
+
+Document = List[List[str]]
+
+
+def make_sentence(rng: random.Random) -> str:
+    return " ".join(rng.choices(WORDS, k=rng.randint(6, 25))).capitalize() + "."
+
+
+def make_document(rng: random.Random, paragraphs: int = 200) -> Document:
+    return [
+        [make_sentence(rng) for _ in range(rng.randint(2, 8))]
+        for _ in range(paragraphs)
+    ]
+
+
+def edit_document(rng: random.Random, document: Document) -> Document:
+    """Insert, delete or rewrite one sentence somewhere in the document."""
+    edited = copy.deepcopy(document)
+    paragraph = rng.choice(edited)
+    index = rng.randrange(len(paragraph))
+    action = rng.choice(["insert", "delete", "replace"])
+    if action == "insert":
+        paragraph.insert(index, make_sentence(rng))
+    elif action == "delete" and len(paragraph) > 1:
+        del paragraph[index]
+    else:
+        paragraph[index] = make_sentence(rng)
+    return edited
+
+
+def render(document: Document, layout: str) -> str:
+    paragraphs = [" ".join(sentences) for sentences in document]
+    if layout == "wrapped":
+        # PDF-like extraction: hard-wrapped lines, no blank lines
+        return "\n".join(textwrap.fill(paragraph, 80) for paragraph in paragraphs)
+    if layout == "flat":
+        return " ".join(paragraphs)
+    return "\n\n".join(paragraphs)
+
+
+def stability(split: Callable[[str], List[str]], before: str, after: str) -> float:
+    known = set(split(before))
+    chunks = split(after)
+    return sum(chunk in known for chunk in chunks) / len(chunks)
+
+
+def main(trials: int = 50, seed: int = 0) -> None:
+    rng = random.Random(seed)
+    strategies = {
+        "recursive": RecursiveCharacterTextSplitter(
+            chunk_size=1000, chunk_overlap=100, separators=["\n\n", "\n", " ", ""]
+        ).split_text,
+        "content_defined": ContentDefinedChunker(
+            target_size=1000, min_size=250, max_size=2000
+        ).split_text,
+    }
+    layouts = ["paragraphs", "wrapped", "flat"]
+    ratios = {(layout, name): [] for layout in layouts for name in strategies}
+    for _ in range(trials):
+        original = make_document(rng)
+        edited = edit_document(rng, original)
+        for layout in layouts:
+            before, after = render(original, layout), render(edited, layout)
+            for name, split in strategies.items():
+                ratios[layout, name].append(stability(split, before, after))
+
+    print(f"{'layout':<12}{'strategy':<18}{'mean':>8}{'min':>8}")
+    for (layout, name), values in ratios.items():
+        print(
+            f"{layout:<12}{name:<18}"
+            f"{statistics.mean(values):>8.3f}{min(values):>8.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""Trade-off between prompt size and content kept by sentence pre-compression.
+
+    python -m benchmarks.compression_quality [file.txt] [--provider openai]
+
+For each method and ratio it reports the characters sent to the model and the
+IDF-weighted share of the document's distinct terms that survive. With ``--provider``
+it also summarizes every variant and reports the ROUGE-1 F1 of its summary
+against the summary of the uncompressed text (this calls the provider).
+"""
+import argparse
+import random
+from collections import Counter
+from typing import List, Optional
+
+from src.processors.compression import SentenceCompressor, split_sentences, tokenize
+from src.services.summary import SummaryGenerator
+
+RATIOS = [1.0, 0.8, 0.6, 0.4, 0.2]
+BOILERPLATE = [
+    "This document is confidential and intended solely for the addressee.",
+    "Page intentionally left blank.",
+    "All figures are unaudited unless stated otherwise.",
+]
+
+
+def make_redundant_text(seed: int = 0, paragraphs: int = 60) -> str:
+    """Synthetic report with a Zipf vocabulary and boilerplate in every paragraph."""
+    rng = random.Random(seed)
+    syllables = ["ka", "lo", "mi", "ren", "tu", "sa", "vel", "dor", "pi", "an"]
+    vocabulary = sorted(
+        {"".join(rng.choices(syllables, k=rng.randint(2, 4))) for _ in range(3000)}
+    )
+    weights = [1 / rank for rank in range(1, len(vocabulary) + 1)]
+    result = []
+    for _ in range(paragraphs):
+        sentences = [
+            " ".join(rng.choices(vocabulary, weights, k=rng.randint(6, 25)))
+            .capitalize()
+            + "."
+            for _ in range(rng.randint(3, 8))
+        ]
+        sentences += rng.sample(BOILERPLATE, 2)
+        rng.shuffle(sentences)
+        result.append(" ".join(sentences))
+    return "\n\n".join(result)
+
+
+def term_coverage(compressor: SentenceCompressor, compressed: List[str]) -> float:
+    """IDF-weighted share of the document's distinct terms still present."""
+    kept = {
+        compressor.vocabulary[token]
+        for chunk in compressed
+        for token in tokenize(chunk)
+        if token in compressor.vocabulary
+    }
+    return compressor.idf[list(kept)].sum() / compressor.idf.sum()
+
+
+def rouge1_f1(candidate: str, reference: str) -> float:
+    candidate_counts = Counter(tokenize(candidate))
+    reference_counts = Counter(tokenize(reference))
+    overlap = sum((candidate_counts & reference_counts).values())
+    if not overlap:
+        return 0.0
+    precision = overlap / sum(candidate_counts.values())
+    recall = overlap / sum(reference_counts.values())
+    return 2 * precision * recall / (precision + recall)
+
+
+def main(text: str, provider: Optional[str]) -> None:
+    model = None
+    if provider:
+        from src.services.model_manager import ModelManager
+
+        model = ModelManager.get_model(provider)
+
+    chunks = SummaryGenerator(None).chunk_text(text)
+    original = sum(len(chunk) for chunk in chunks)
+    reference = None
+    if model is not None:
+        reference = SummaryGenerator(model).generate_summary(text).data.summary
+
+    print(f"{len(split_sentences(text))} sentences, {len(chunks)} chunks")
+    header = f"{'method':<10}{'ratio':>6}{'chars':>10}{'share':>7}{'terms':>10}"
+    print(header + ("" if model is None else f"{'rouge1':>8}"))
+    for method in ["tfidf", "textrank"]:
+        compressor = SentenceCompressor(1.0, method).fit(text)
+        for ratio in RATIOS:
+            compressor.ratio = ratio
+            compressed = compressor.compress_chunks(chunks)
+            sent = sum(len(chunk) for chunk in compressed)
+            row = (
+                f"{method:<10}{ratio:>6.1f}{sent:>10}{sent / original:>7.2f}"
+                f"{term_coverage(compressor, compressed):>10.2f}"
+            )
+            if model is not None:
+                summarizer = SummaryGenerator(
+                    model, compression_ratio=ratio, compression_method=method
+                )
+                response = summarizer.generate_summary(text)
+                row += f"{rouge1_f1(response.data.summary, reference):>8.3f}"
+            print(row)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("file", nargs="?", help="TXT file to compress")
+    parser.add_argument("--provider", help="model provider for summary quality")
+    args = parser.parse_args()
+    if args.file:
+        with open(args.file, encoding="utf-8") as handle:
+            main(handle.read(), args.provider)
+    else:
+        main(make_redundant_text(), args.provider)
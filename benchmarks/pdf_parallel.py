@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""Time PDF extraction with an increasing number of page-parsing processes.
+
+    python -m benchmarks.pdf_parallel [file.pdf]
+
+Without a file a synthetic text-only PDF is generated first.
+"""
+import os
+import sys
+import tempfile
+import time
+
+from src.processors.document import DocumentProcessor
+from tests.pdf_helpers import write_sample_pdf
+
+
+def main(file_path: str) -> None:
+    baseline = None
+    worker_counts = sorted({1, 2, 4, os.cpu_count() or 1})
+    print(f"{'workers':>8}{'seconds':>10}{'speedup':>10}")
+    for workers in worker_counts:
+        started = time.perf_counter()
+        response = DocumentProcessor(file_path, pdf_workers=workers).extract_text()
+        elapsed = time.perf_counter() - started
+        assert response.success, response.message
+        baseline = baseline or elapsed
+        print(f"{workers:>8}{elapsed:>10.2f}{baseline / elapsed:>10.2f}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        main(sys.argv[1])
+    else:
+        with tempfile.TemporaryDirectory() as directory:
+            sample = os.path.join(directory, "sample.pdf")
+            write_sample_pdf(sample, pages=2000)
+            main(sample)
@@ -0,0 +1,340 @@
+import asyncio
+import os
+import time
+import uuid
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import AsyncIterator, Optional
+
+from aiohttp import web
+
+from src.config.settings import ConfigSettings
+from src.models.schemas import APIResponse, ContentStream, DocumentResponse
+from src.processors.document import DocumentProcessor
+from src.services.concurrency import concurrency_metrics
+from src.services.model_manager import Model, ModelManager
+from src.services.prompts import PromptCacheStats
+from src.services.summary import PROMPT_TEMPLATES, SummaryGenerator
+from src.utils.my_logging import setup_logger
+
+logger = setup_logger()
+config = ConfigSettings()
+
+ALLOWED_SUFFIXES = {".pdf", ".txt", ".docx"}
+# How often expired uploads are looked for (see SERVER_UPLOAD_TTL).
+UPLOAD_SWEEP_INTERVAL = 60.0
+
+
+class Overloaded(Exception):
+    """Raised when a limiter has no free slot and no room left in its queue."""
+
+
+class AdmissionLimiter:
+    """Run at most ``max_concurrency`` jobs and queue up to ``max_queue`` more.
+
+    Requests beyond that are rejected immediately instead of piling up, so the
+    service sheds load with a 503 while the admitted requests keep their latency.
+    """
+
+    def __init__(self, max_concurrency: int, max_queue: int):
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._capacity = max_concurrency + max_queue
+        self.pending = 0
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        if self.pending >= self._capacity:
+            raise Overloaded()
+        self.pending += 1
+        try:
+            async with self._semaphore:
+                yield
+        finally:
+            self.pending -= 1
+
+
+def _warm_worker() -> None:
+    """Import the document loaders once per worker instead of once per request."""
+    # pylint: disable=import-outside-toplevel,unused-import
+    import src.processors.document  # noqa: F401
+
+
+def _extract(file_path: str) -> APIResponse:
+    # spooled to disk, so only a path is pickled back from the worker
+    return DocumentProcessor(file_path).extract_text(inline=False)
+
+
+def _discard(response: APIResponse) -> None:
+    """Remove the spooled text of an extraction response, if any."""
+    if isinstance(response.data, DocumentResponse) and response.data.content_path:
+        Path(response.data.content_path).unlink(missing_ok=True)
+
+
+def _discard_result(future: Future) -> None:
+    """Done-callback that drops the spooled text of an abandoned extraction."""
+    if not future.cancelled() and future.exception() is None:
+        _discard(future.result())
+
+
+async def _read_json(request: web.Request) -> Optional[dict]:
+    try:
+        body = await request.json()
+    except ValueError:
+        return None
+    return body if isinstance(body, dict) else None
+
+
+def _status(response: APIResponse) -> int:
+    return response.code if response.code >= 400 else 200
+
+
+def _json_response(response: APIResponse) -> web.Response:
+    return web.json_response(response.model_dump(), status=_status(response))
+
+
+async def _stream_json(
+    request: web.Request, response: APIResponse
+) -> web.StreamResponse:
+    """Write the response body piece by piece instead of dumping it at once."""
+    stream = web.StreamResponse(
+        status=_status(response),
+        headers={"Content-Type": "application/json; charset=utf-8"},
+    )
+    await stream.prepare(request)
+    for piece in response.iter_json():
+        await stream.write(piece.encode("utf-8"))
+    await stream.write_eof()
+    return stream
+
+
+def _error(code: int, message: str) -> web.Response:
+    return _json_response(
+        APIResponse(success=False, code=code, message=message, data=None)
+    )
+
+
+class DocumentService:
+    """HTTP front-end sharing one warm model and worker pools across requests."""
+
+    def __init__(
+        self,
+        model: Model,
+        upload_dir: str,
+        parse_executor: Executor,
+        model_executor: Executor,
+        max_concurrency: int,
+        max_queue: int,
+    ):
+        self.summarizer = SummaryGenerator(model)
+        self.upload_dir = Path(upload_dir)
+        self.upload_dir.mkdir(parents=True, exist_ok=True)
+        self.parse_executor = parse_executor
+        self.model_executor = model_executor
+        self.parse_limiter = AdmissionLimiter(max_concurrency, max_queue)
+        self.summary_limiter = AdmissionLimiter(max_concurrency, max_queue)
+
+    async def metrics(self, _request: web.Request) -> web.Response:
+        prompt_cache = self.summarizer.model.prompt_cache
+        return web.json_response(
+            {
+                "concurrency": concurrency_metrics(),
+                "prompt_cache": (
+                    prompt_cache.metrics()
+                    if isinstance(prompt_cache, PromptCacheStats)
+                    else None
+                ),
+                "queues": {
+                    "parse": self.parse_limiter.pending,
+                    "summary": self.summary_limiter.pending,
+                },
+            }
+        )
+
+    def _resolve(self, file_id: str) -> Optional[Path]:
+        """Map an upload id back to its file, refusing anything outside uploads."""
+        path = self.upload_dir / Path(file_id).name
+        return path if path.is_file() else None
+
+    async def _extract(self, file_id: str) -> APIResponse:
+        path = self._resolve(file_id)
+        if path is None:
+            return APIResponse(
+                success=False, code=400, message="File not found", data=None
+            )
+        async with self.parse_limiter.slot():
+            future = self.parse_executor.submit(_extract, str(path))
+            try:
+                return await asyncio.wrap_future(future)
+            except asyncio.CancelledError:
+                # The worker keeps running after the request goes away, and
+                # nobody else will see its spool file.
+                future.add_done_callback(_discard_result)
+                raise
+
+    def sweep_uploads(self, max_age: float) -> int:
+        """Delete uploads older than ``max_age`` seconds; returns how many."""
+        cutoff = time.time() - max_age
+        removed = 0
+        for path in self.upload_dir.iterdir():
+            try:
+                if path.is_file() and path.stat().st_mtime < cutoff:
+                    path.unlink()
+                    removed += 1
+            except FileNotFoundError:
+                continue
+        if removed:
+            logger.info("Removed %d expired uploads", removed)
+        return removed
+
+    async def upload(self, request: web.Request) -> web.Response:
+        try:
+            reader = await request.multipart()
+        except (AssertionError, ValueError):
+            # aiohttp asserts on a non-multipart content type
+            return _error(400, "Expected a multipart/form-data upload")
+        field = await reader.next()
+        if field is None or not getattr(field, "filename", None):
+            return _error(400, "No file uploaded")
+
+        suffix = Path(field.filename).suffix.lower()
+        if suffix not in ALLOWED_SUFFIXES:
+            return _error(
+                400, "Unsupported file format. Only PDF, TXT, and DOCX are allowed."
+            )
+
+        file_id = f"{uuid.uuid4().hex}{suffix}"
+        path = self.upload_dir / file_id
+        size = 0
+        with open(path, "wb") as handle:
+            while chunk := await field.read_chunk():
+                size += len(chunk)
+                if size > config.SERVER_MAX_UPLOAD_SIZE:
+                    break
+                handle.write(chunk)
+        if size > config.SERVER_MAX_UPLOAD_SIZE:
+            path.unlink()
+            return _error(413, "File too large")
+
+        logger.info("Uploaded %s (%d bytes)", file_id, size)
+        return web.json_response(
+            {
+                "success": True,
+                "code": 200,
+                "message": "File uploaded successfully",
+                "data": {"file_id": file_id, "size": size},
+            }
+        )
+
+    async def extract(self, request: web.Request) -> web.StreamResponse:
+        body = await _read_json(request)
+        if body is None or not isinstance(body.get("file_id"), str):
+            return _error(400, "file_id is required")
+        try:
+            response = await self._extract(body["file_id"])
+        except Overloaded:
+            return _error(503, "Server busy, try again later")
+        try:
+            return await _stream_json(request, response)
+        finally:
+            _discard(response)
+
+    async def summarize(self, request: web.Request) -> web.Response:
+        body = await _read_json(request)
+        if body is None:
+            return _error(400, "Invalid JSON body")
+        summary_type = body.get("summary_type", "brief")
+        if not isinstance(summary_type, str) or summary_type not in PROMPT_TEMPLATES:
+            return _error(
+                400, f"summary_type must be one of: {', '.join(PROMPT_TEMPLATES)}"
+            )
+        text = body.get("text")
+        if text is not None and not isinstance(text, str):
+            return _error(400, "text must be a string")
+        if text is None and not isinstance(body.get("file_id"), str):
+            return _error(400, "text or file_id is required")
+        extracted = None
+        try:
+            if text is None:
+                extracted = await self._extract(body["file_id"])
+                if extracted.data is None:
+                    return _json_response(extracted)
+                # stream the spooled text into the chunker
+                text = ContentStream(extracted.data)
+
+            loop = asyncio.get_running_loop()
+            async with self.summary_limiter.slot():
+                response = await loop.run_in_executor(
+                    self.model_executor,
+                    self.summarizer.generate_summary,
+                    text,
+                    summary_type,
+                )
+        except Overloaded:
+            return _error(503, "Server busy, try again later")
+        finally:
+            if extracted is not None:
+                _discard(extracted)
+        return _json_response(response)
+
+
+SERVICE_KEY = web.AppKey("service", DocumentService)
+
+
+def create_app(
+    model: Optional[Model] = None,
+    upload_dir: Optional[str] = None,
+    parse_executor: Optional[Executor] = None,
+    model_executor: Optional[Executor] = None,
+) -> web.Application:
+    """Build the application; anything not passed in is created from config."""
+    owned = []
+    if parse_executor is None:
+        parse_executor = ProcessPoolExecutor(
+            max_workers=config.SERVER_PARSE_WORKERS or os.cpu_count(),
+            initializer=_warm_worker,
+        )
+        owned.append(parse_executor)
+    if model_executor is None:
+        model_executor = ThreadPoolExecutor(max_workers=config.SERVER_MAX_CONCURRENCY)
+        owned.append(model_executor)
+
+    service = DocumentService(
+        model=model or ModelManager.get_model(config.SERVER_MODEL_PROVIDER),
+        upload_dir=upload_dir or config.SERVER_UPLOAD_DIR,
+        parse_executor=parse_executor,
+        model_executor=model_executor,
+        max_concurrency=config.SERVER_MAX_CONCURRENCY,
+        max_queue=config.SERVER_MAX_QUEUE,
+    )
+
+    async def shutdown(_app: web.Application) -> None:
+        for executor in owned:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    async def sweep_uploads(_app: web.Application) -> AsyncIterator[None]:
+        async def sweep() -> None:
+            while True:
+                service.sweep_uploads(config.SERVER_UPLOAD_TTL)
+                await asyncio.sleep(UPLOAD_SWEEP_INTERVAL)
+
+        task = (
+            asyncio.create_task(sweep()) if config.SERVER_UPLOAD_TTL > 0 else None
+        )
+        yield
+        if task is not None:
+            task.cancel()
+
+    app = web.Application(client_max_size=config.SERVER_MAX_UPLOAD_SIZE)
+    app[SERVICE_KEY] = service
+    app.router.add_post("/upload", service.upload)
+    app.router.add_post("/extract", service.extract)
+    app.router.add_post("/summarize", service.summarize)
+    app.router.add_get("/metrics", service.metrics)
+    app.on_cleanup.append(shutdown)
+    app.cleanup_ctx.append(sweep_uploads)
+    return app
+
+
+if __name__ == "__main__":
+    web.run_app(create_app(), host=config.SERVER_HOST, port=config.SERVER_PORT)
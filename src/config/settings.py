@@ -1,7 +1,11 @@
 from dotenv import load_dotenv
+from typing import Dict, List, Literal, Optional
+
 from pydantic import SecretStr, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+from src.models.schemas import RoutingRule, RoutingTarget
+
 load_dotenv(override=True)
 
 
@@ -18,9 +22,70 @@ class ConfigSettings(BaseSettings):
     CHECK_EVERY_N_SECONDS: float = 1
     MAX_BUCKET_SIZE: int = 10
 
+    # Per-chunk Model Routing (ModelManager.get_model("routing")), first rule wins
+    ROUTING_TARGETS: Dict[str, RoutingTarget] = {
+        "fast": RoutingTarget(
+            provider="openai", model="gpt-4o-mini", cost_per_1k_tokens=0.00015
+        ),
+        "strong": RoutingTarget(
+            provider="anthropic",
+            model="claude-3-opus-20240229",
+            cost_per_1k_tokens=0.015,
+        ),
+    }
+    ROUTING_RULES: List[RoutingRule] = [
+        RoutingRule(target="fast", max_chars=400),
+        RoutingRule(
+            target="fast",
+            max_chars=1500,
+            languages=["en"],
+            summary_types=["brief", "bullet points", "layman"],
+        ),
+    ]
+    ROUTING_DEFAULT_TARGET: str = "strong"
+
+    # Adaptive Concurrency (AIMD on latency and 429s, per provider)
+    ADAPTIVE_CONCURRENCY: bool = False
+    ADAPTIVE_INITIAL_LIMIT: int = 4
+    ADAPTIVE_MIN_LIMIT: int = 1
+    ADAPTIVE_MAX_LIMIT: int = 64
+    ADAPTIVE_BACKOFF_RATIO: float = 0.9
+    ADAPTIVE_LATENCY_TOLERANCE: float = 2.0
+
+    # Prompt Caching (instructions and outline sent as a cacheable shared prefix)
+    PROMPT_CACHING: bool = False
+    PROMPT_OUTLINE_MAX_CHARS: int = 0  # > 0 adds the document's headings to it
+
     # Text Splitting Configuration
     CHUNK_SIZE: int = 1000
     CHUNK_OVERLAP: int = 100
+    # "recursive" (fixed size + overlap) or "content_defined" (edit-stable cuts)
+    CHUNK_STRATEGY: Literal["recursive", "content_defined"] = "recursive"
+    CHUNK_MIN_SIZE: int = 250
+    CHUNK_MAX_SIZE: int = 2000
+
+    # Extractive Pre-compression (1.0 sends chunks verbatim)
+    COMPRESSION_RATIO: float = 1.0
+    COMPRESSION_METHOD: Literal["tfidf", "textrank"] = "tfidf"
+
+    # Document Parsing Configuration
+    PDF_PARSE_WORKERS: int = 1  # > 1 parses one large PDF in that many processes
+    PDF_PARALLEL_MIN_PAGES: int = 64
+    SPOOL_DIR: Optional[str] = None  # where extract_text(inline=False) writes text
+
+    # HTTP Service Configuration
+    SERVER_HOST: str = "0.0.0.0"
+    SERVER_PORT: int = 8080
+    SERVER_MODEL_PROVIDER: str = "openai"
+    SERVER_UPLOAD_DIR: str = "uploads"
+    SERVER_MAX_UPLOAD_SIZE: int = 200 * 1024 * 1024
+    SERVER_PARSE_WORKERS: Optional[int] = None  # defaults to the CPU count
+    SERVER_MAX_CONCURRENCY: int = 8
+    SERVER_MAX_QUEUE: int = 32
+    SERVER_UPLOAD_TTL: float = 24 * 60 * 60  # seconds; 0 keeps uploads forever
+
+    # Job Queue Configuration
+    JOB_DB_PATH: str = "jobs.db"
 
     @field_validator("OPENAI_API_KEY", "ANTHROPIC_API_KEY", mode="before")
     @classmethod
@@ -1,8 +1,11 @@
+import json
 from pathlib import Path
-from typing import Literal, Optional, Union
+from typing import Iterable, Iterator, List, Literal, Optional, Union
 
 from pydantic import BaseModel, Field, field_validator
 
+CONTENT_CHUNK_SIZE = 1024 * 1024
+
 
 class DocumentProcessorInput(BaseModel):
     file_path: str
@@ -27,6 +30,48 @@ class DocumentResponse(BaseModel):
     content: Optional[str] = Field(
         None, description="Extracted text content from the document"
     )
+    content_path: Optional[str] = Field(
+        None, description="File holding the extracted text when it is not inline"
+    )
+    pages: Optional[Iterable[str]] = Field(
+        None, exclude=True, description="Lazily extracted text, consumed once"
+    )
+
+    def iter_content(self, chunk_size: int = CONTENT_CHUNK_SIZE) -> Iterator[str]:
+        """Yield the text in pieces from wherever it is held."""
+        if self.content is not None:
+            for start in range(0, len(self.content), chunk_size):
+                yield self.content[start : start + chunk_size]
+        elif self.content_path is not None:
+            with open(self.content_path, encoding="utf-8") as handle:
+                while piece := handle.read(chunk_size):
+                    yield piece
+        elif self.pages is not None:
+            yield from self.pages
+
+    def read_content(self) -> str:
+        if self.content is not None:
+            return self.content
+        return "".join(self.iter_content())
+
+
+class ContentStream:
+    """Re-iterable view of a document's text; every pass reads it again.
+
+    Lets a consumer make more than one pass over spooled text (e.g. to fit
+    compression weights first) without holding it in memory.
+    """
+
+    def __init__(
+        self, document: DocumentResponse, chunk_size: int = CONTENT_CHUNK_SIZE
+    ):
+        if document.content is None and document.content_path is None:
+            raise ValueError("Document pages can only be read once")
+        self.document = document
+        self.chunk_size = chunk_size
+
+    def __iter__(self) -> Iterator[str]:
+        return self.document.iter_content(self.chunk_size)
 
 
 class SummaryResponse(BaseModel):
@@ -39,3 +84,63 @@ class APIResponse(BaseModel):
     code: int
     message: str
     data: Optional[Union[DocumentResponse, SummaryResponse]] = None
+
+    def iter_json(self, chunk_size: int = CONTENT_CHUNK_SIZE) -> Iterator[str]:
+        """Serialize lazily, streaming document content instead of copying it.
+
+        Gives the same JSON as ``model_dump_json``, except that content held in
+        ``content_path`` or ``pages`` is written inline under ``content`` and
+        ``content_path`` itself is left out.
+        """
+        if not isinstance(self.data, DocumentResponse):
+            yield self.model_dump_json()
+            return
+
+        envelope = self.model_dump(mode="json", exclude={"data"})
+        data = self.data.model_dump(mode="json", exclude={"content", "content_path"})
+        yield json.dumps(envelope, ensure_ascii=False)[:-1] + ', "data": '
+        yield json.dumps(data, ensure_ascii=False)[:-1]
+        sources = (self.data.content, self.data.content_path, self.data.pages)
+        if all(source is None for source in sources):
+            yield ', "content": null}}'
+            return
+        yield ', "content": "'
+        for piece in self.data.iter_content(chunk_size):
+            yield json.dumps(piece, ensure_ascii=False)[1:-1]
+        yield '"}}'
+
+
+class PromptParts(BaseModel):
+    """A prompt split into a chunk-independent ``prefix`` and the chunk ``suffix``."""
+
+    prefix: str
+    suffix: str
+
+
+class RoutingTarget(BaseModel):
+    provider: Literal["openai", "anthropic"]
+    model: str
+    cost_per_1k_tokens: float = 0.0
+
+
+class RoutingRule(BaseModel):
+    """Send a chunk to ``target`` when every condition that is set holds."""
+
+    target: str
+    min_chars: Optional[int] = None
+    max_chars: Optional[int] = None
+    languages: Optional[List[str]] = None
+    summary_types: Optional[List[str]] = None
+
+    def matches(
+        self, chars: int, language: Optional[str], summary_type: Optional[str]
+    ) -> bool:
+        if self.min_chars is not None and chars < self.min_chars:
+            return False
+        if self.max_chars is not None and chars > self.max_chars:
+            return False
+        if self.languages is not None and language not in self.languages:
+            return False
+        if self.summary_types is not None and summary_type not in self.summary_types:
+            return False
+        return True
@@ -0,0 +1,159 @@
+import re
+import zlib
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+# Candidate boundaries: a blank line (paragraph) or a sentence end / line break.
+# A match containing a blank line is a paragraph break, whether or not it starts
+# at a sentence end (".\n\n" is matched by the sentence branch).
+_BOUNDARY_RE = re.compile(r"\n[ \t]*\n\s*|[.!?。！？][\"'”’)\]]*\s+|\n")
+_BLANK_LINE_RE = re.compile(r"\n[ \t]*\n")
+
+HASH_WINDOW = 32
+# Text kept past ``max_size`` before a streamed cut is final, so that a boundary
+# split across two windows (e.g. ". " + " ") is matched the same way.
+STREAM_LOOKAHEAD = 256
+PARAGRAPH_BIAS = 4.0
+_HASH_RANGE = float(1 << 32)
+
+
+def _match_start(text: str, position: int) -> int:
+    """Move ``position`` back to the start of a boundary match spanning it."""
+    for match in _BOUNDARY_RE.finditer(text):
+        if match.start() >= position:
+            break
+        if match.end() > position:
+            return match.start()
+    return position
+
+
+class ContentDefinedChunker:
+    """Split text on boundaries chosen by the content instead of by offsets.
+
+    Candidate cut points are paragraph breaks and sentence ends. A candidate
+    becomes a cut when the hash of the ``HASH_WINDOW`` characters in front of it
+    falls under a threshold, so an edit only moves the cuts next to it and the
+    chunks before and after it stay byte-identical. ``min_size``/``max_size``
+    bound the chunk length (two thresholds, two divisors): if no cut fires
+    before ``max_size`` the latest paragraph (or sentence) break is used.
+    """
+
+    def __init__(
+        self,
+        target_size: int,
+        min_size: int,
+        max_size: int,
+        strip_whitespace: bool = True,
+    ):
+        if not 0 <= min_size < target_size <= max_size:
+            raise ValueError(
+                "Chunk sizes must satisfy 0 <= min_size < target_size <= max_size"
+            )
+        self.target_size = target_size
+        self.min_size = min_size
+        self.max_size = max_size
+        self.strip_whitespace = strip_whitespace
+
+    def split_text(self, text: str) -> List[str]:
+        return list(
+            self._clean(text[start:end] for start, end in self.split_offsets(text))
+        )
+
+    def iter_chunks(self, windows: Iterable[str]) -> Iterator[str]:
+        """Chunk text arriving in pieces, giving the same chunks as ``split_text``.
+
+        Only ``max_size`` plus a small lookahead is buffered beyond the current
+        window (more only while a boundary's whitespace run is longer than that),
+        so memory does not grow with the length of the stream.
+        """
+        buffer = ""
+        start = 0
+        for window in windows:
+            buffer += window
+            ready = []
+            for span in self.split_offsets(buffer, start):
+                # a cut is final once everything it could depend on has arrived
+                if span[0] + self.max_size + STREAM_LOOKAHEAD > len(buffer):
+                    break
+                ready.append(span)
+            if ready:
+                yield from self._clean(buffer[a:b] for a, b in ready)
+                # keep the hash window in front of the next chunk's candidates,
+                # and any boundary that straddles it, whole
+                keep_from = _match_start(buffer, max(0, ready[-1][1] - HASH_WINDOW))
+                buffer = buffer[keep_from:]
+                start = ready[-1][1] - keep_from
+        spans = self.split_offsets(buffer, start)
+        yield from self._clean(buffer[a:b] for a, b in spans)
+
+    def _clean(self, chunks: Iterable[str]) -> Iterator[str]:
+        for chunk in chunks:
+            if self.strip_whitespace:
+                chunk = chunk.strip()
+            if chunk:
+                yield chunk
+
+    def split_offsets(self, text: str, start: int = 0) -> List[Tuple[int, int]]:
+        """Return ``(start, end)`` spans that exactly cover ``text[start:]``."""
+        candidates = [
+            (match.end(), _BLANK_LINE_RE.search(match.group()) is not None)
+            for match in _BOUNDARY_RE.finditer(text)
+            if start < match.end() < len(text)
+        ]
+        spans = []
+        index = 0
+        while start < len(text):
+            cut, index = self._next_cut(text, start, candidates, index)
+            spans.append((start, cut))
+            start = cut
+        return spans
+
+    def _next_cut(
+        self,
+        text: str,
+        start: int,
+        candidates: List[Tuple[int, bool]],
+        index: int,
+    ) -> Tuple[int, int]:
+        previous = start
+        backup: Optional[Tuple[int, bool]] = None
+        for i in range(index, len(candidates)):
+            position, is_paragraph = candidates[i]
+            size = position - start
+            if size > self.max_size:
+                break
+            if size >= self.min_size:
+                if self._is_cut(text, position, position - previous, is_paragraph):
+                    return position, i + 1
+                if backup is None or is_paragraph or not backup[1]:
+                    backup = (position, is_paragraph)
+            previous = position
+
+        if len(text) - start <= self.max_size:
+            cut = len(text)
+        elif backup is not None:
+            cut = backup[0]
+        else:
+            cut = self._hard_cut(text, start)
+        return cut, self._skip_to(candidates, index, cut)
+
+    def _is_cut(self, text: str, position: int, gap: int, is_paragraph: bool) -> bool:
+        # Scale by the distance to the previous candidate so that the cut rate
+        # per character stays near 1 / (target - min) however dense sentences are.
+        threshold = gap / (self.target_size - self.min_size)
+        if is_paragraph:
+            threshold *= PARAGRAPH_BIAS
+        window = text[max(0, position - HASH_WINDOW) : position]
+        digest = zlib.crc32(window.encode("utf-8", "surrogatepass"))
+        return digest / _HASH_RANGE < threshold
+
+    def _hard_cut(self, text: str, start: int) -> int:
+        """Cut an oversized run with no candidates after its last whitespace."""
+        limit = start + self.max_size
+        space = text.rfind(" ", start + self.min_size, limit)
+        return space + 1 if space >= 0 else limit
+
+    @staticmethod
+    def _skip_to(candidates: List[Tuple[int, bool]], index: int, cut: int) -> int:
+        while index < len(candidates) and candidates[index][0] <= cut:
+            index += 1
+        return index
@@ -0,0 +1,179 @@
+import re
+from typing import Dict, Iterable, Iterator, List, Optional, Set
+
+import numpy as np
+
+# A sentence ends at terminal punctuation followed by whitespace (so "4.2" is
+# not split), at CJK terminal punctuation, or at a line break.
+_SENTENCE_RE = re.compile(
+    r"\S.*?(?:[.!?]+[\"'”’)\]]*(?=\s|$)|[。！？]+[\"'”’)\]]*|(?=\n)|$)"
+)
+_TOKEN_RE = re.compile(r"\w+")
+
+TEXTRANK_DAMPING = 0.85
+TEXTRANK_ITERATIONS = 30
+
+
+def split_sentences(text: str) -> List[str]:
+    sentences = (match.group().strip() for match in _SENTENCE_RE.finditer(text))
+    return [sentence for sentence in sentences if sentence]
+
+
+def tokenize(sentence: str) -> List[str]:
+    return _TOKEN_RE.findall(sentence.lower())
+
+
+def iter_sentence_batches(windows: Iterable[str]) -> Iterator[List[str]]:
+    """Split text arriving in pieces into sentences, batch by batch.
+
+    The last sentence of each window is held back until the next one shows
+    whether it continues, so only one partial sentence is kept in memory.
+    """
+    pending = ""
+    for window in windows:
+        pending += window
+        starts = [match.start() for match in _SENTENCE_RE.finditer(pending)]
+        if len(starts) > 1:
+            yield split_sentences(pending[: starts[-1]])
+            pending = pending[starts[-1] :]
+    yield split_sentences(pending)
+
+
+class SentenceCompressor:
+    """Drop low-information sentences from chunks before they reach the model.
+
+    Term weights (IDF) are computed once over all sentences of the document, so
+    boilerplate repeated across the document scores low everywhere. Sentences
+    are ranked by mean TF-IDF weight or by TextRank centrality within the chunk,
+    and the lowest ranked ones are removed until the chunk is at most ``ratio``
+    of its original length. Exact repeats of earlier sentences are removed first.
+    """
+
+    def __init__(self, ratio: float, method: str = "tfidf"):
+        if not 0 < ratio <= 1:
+            raise ValueError("Compression ratio must be in (0, 1]")
+        if method not in ("tfidf", "textrank"):
+            raise ValueError(f"Invalid compression method: {method}")
+        self.ratio = ratio
+        self.method = method
+        self.vocabulary: Dict[str, int] = {}
+        self.idf = np.ones(0)
+
+    def fit(self, text: str) -> "SentenceCompressor":
+        """Learn IDF weights from every sentence of the whole document."""
+        return self.fit_stream([text])
+
+    def fit_stream(self, windows: Iterable[str]) -> "SentenceCompressor":
+        """Learn IDF weights from a document given in pieces (e.g. a first pass)."""
+        vocabulary: Dict[str, int] = {}
+        document_frequency = np.zeros(0, dtype=np.int64)
+        sentence_count = 0
+        for batch in iter_sentence_batches(windows):
+            counts = self._document_frequency(batch, vocabulary)
+            document_frequency = (
+                np.pad(document_frequency, (0, len(counts) - len(document_frequency)))
+                + counts
+            )
+            sentence_count += len(batch)
+        self.vocabulary = vocabulary
+        self.idf = np.log((1 + sentence_count) / (1 + document_frequency)) + 1
+        return self
+
+    @staticmethod
+    def _document_frequency(
+        batch: List[str], vocabulary: Dict[str, int]
+    ) -> np.ndarray:
+        """Count the sentences of ``batch`` containing each term, adding new terms."""
+        sentences = [tokenize(sentence) for sentence in batch]
+        term_ids = [
+            [vocabulary.setdefault(token, len(vocabulary)) for token in tokens]
+            for tokens in sentences
+        ]
+        sentence_ids = np.repeat(
+            np.arange(len(sentences)), [len(ids) for ids in term_ids]
+        )
+        flat = np.fromiter(
+            (term for ids in term_ids for term in ids),
+            dtype=np.int64,
+            count=len(sentence_ids),
+        )
+        # document frequency = number of sentences containing the term
+        pairs = np.unique(sentence_ids * len(vocabulary) + flat)
+        return np.bincount(pairs % max(1, len(vocabulary)), minlength=len(vocabulary))
+
+    def compress_chunks(self, chunks: List[str]) -> List[str]:
+        """Compress chunks in document order, dropping sentences already seen."""
+        seen: Set[str] = set()
+        return [self.compress(chunk, seen) for chunk in chunks]
+
+    def compress(self, chunk: str, seen: Optional[Set[str]] = None) -> str:
+        """Compress one chunk; sentences in ``seen`` (then added to it) are dropped."""
+        seen = set() if seen is None else seen
+        sentences = []
+        for sentence in split_sentences(chunk):
+            if sentence not in seen:
+                sentences.append(sentence)
+                seen.add(sentence)
+        if not sentences:
+            # keep the chunk non-empty even if all of it was said before
+            sentences = split_sentences(chunk)[:1]
+        if len(sentences) <= 1:
+            return " ".join(sentences)
+
+        lengths = np.array([len(sentence) for sentence in sentences])
+        target = self.ratio * len(chunk)
+        scores = self.score(sentences)
+        order = np.argsort(-scores, kind="stable")
+        # running length of the kept sentences joined by single spaces
+        keep = np.cumsum(lengths[order] + 1) - 1 <= target
+        keep[0] = True  # the best sentence always survives
+        kept = np.sort(order[keep])
+        return " ".join(sentences[index] for index in kept)
+
+    def score(self, sentences: List[str]) -> np.ndarray:
+        """Score each sentence; higher means more informative."""
+        tokens = [tokenize(sentence) for sentence in sentences]
+        lengths = np.array([len(sentence_tokens) for sentence_tokens in tokens])
+        sentence_ids = np.repeat(np.arange(len(sentences)), lengths)
+        # terms unseen by ``fit`` count as rare: they get the highest IDF
+        unseen = self.idf.max() if self.idf.size else 1.0
+        weights = np.fromiter(
+            (
+                self.idf[self.vocabulary[token]] if token in self.vocabulary else unseen
+                for sentence_tokens in tokens
+                for token in sentence_tokens
+            ),
+            dtype=float,
+            count=int(lengths.sum()),
+        )
+        if self.method == "textrank":
+            return self._textrank(tokens, sentence_ids, weights)
+        totals = np.bincount(sentence_ids, weights=weights, minlength=len(sentences))
+        return totals / np.maximum(lengths, 1)
+
+    @staticmethod
+    def _textrank(
+        tokens: List[List[str]], sentence_ids: np.ndarray, weights: np.ndarray
+    ) -> np.ndarray:
+        local: Dict[str, int] = {}
+        flat = [token for words in tokens for token in words]
+        columns = np.array(
+            [local.setdefault(token, len(local)) for token in flat], dtype=np.int64
+        )
+        vectors = np.zeros((len(tokens), max(1, len(local))))
+        np.add.at(vectors, (sentence_ids, columns), weights)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors /= np.where(norms == 0, 1, norms)
+
+        similarity = vectors @ vectors.T
+        np.fill_diagonal(similarity, 0)
+        out_weight = similarity.sum(axis=1, keepdims=True)
+        transition = similarity / np.where(out_weight == 0, 1, out_weight)
+
+        count = len(tokens)
+        ranks = np.full(count, 1 / count)
+        for _ in range(TEXTRANK_ITERATIONS):
+            ranks = (1 - TEXTRANK_DAMPING) / count + TEXTRANK_DAMPING * (
+                transition.T @ ranks
+            )
+        return ranks
@@ -1,18 +1,150 @@
+import codecs
+import mmap
+import os
+import tempfile
+import zipfile
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Tuple
 
-from langchain_community.document_loaders import Docx2txtLoader, PyPDFLoader, TextLoader
+from langchain_community.document_loaders import PyPDFLoader
 from pydantic import ValidationError
+from pypdf import PdfReader
 
+from src.config.settings import ConfigSettings
 from src.models.schemas import APIResponse, DocumentProcessorInput, DocumentResponse
 from src.utils.my_logging import setup_logger
 
 logger = setup_logger()
+config = ConfigSettings()
+
+TEXT_WINDOW_SIZE = 1024 * 1024
+FALLBACK_ENCODING = "cp1252"
+PDF_SHARDS_PER_WORKER = 4
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+# Longest BOMs first: the UTF-32-LE BOM starts with the UTF-16-LE one.
+_BOMS = [
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+]
+
+
+def detect_bom(head: bytes) -> Optional[str]:
+    """Return the encoding announced by a byte order mark, if any."""
+    for bom, encoding in _BOMS:
+        if head.startswith(bom):
+            return encoding
+    return None
+
+
+@contextmanager
+def map_file(file_path: str) -> Iterator[memoryview]:
+    """Memory-map a file read-only; the pages are loaded by the OS on access."""
+    with open(file_path, "rb") as handle:
+        if Path(file_path).stat().st_size == 0:
+            yield memoryview(b"")
+            return
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            with memoryview(mapped) as view:
+                yield view
+
+
+@contextmanager
+def open_pdf(file_path: str) -> Iterator[PdfReader]:
+    """Open a PDF over a read-only mapping, so processes share the page cache."""
+    with open(file_path, "rb") as handle:
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            yield PdfReader(mapped)
+
+
+def extract_pdf_pages(file_path: str, start: int, stop: int) -> List[str]:
+    """Extract pages ``[start, stop)``; runs in a worker for parallel parsing."""
+    with open_pdf(file_path) as reader:
+        return [reader.pages[i].extract_text().strip() for i in range(start, stop)]
+
+
+def page_ranges(page_count: int, shards: int) -> List[Tuple[int, int]]:
+    """Split ``page_count`` pages into at most ``shards`` contiguous ranges."""
+    size = max(1, -(-page_count // max(1, shards)))
+    return [
+        (start, min(start + size, page_count))
+        for start in range(0, page_count, size)
+    ]
+
+
+def _join_pages(shards: Iterable[List[str]]) -> Iterator[str]:
+    """Yield pages with a newline between them, so they join like ``iter_text``."""
+    first = True
+    for shard in shards:
+        for page in shard:
+            yield page if first else f"\n{page}"
+            first = False
+
+
+def no_text_response() -> APIResponse:
+    return APIResponse(
+        success=False, code=204, message="No text found in document", data=None
+    )
+
+
+def iter_docx_paragraphs(file_path: str) -> Iterator[str]:
+    """Yield the paragraphs of a DOCX body one at a time.
+
+    Only ``word/document.xml`` is read from the archive, so embedded media is
+    never decompressed, and parsed elements are dropped as soon as their text
+    has been yielded to keep memory flat.
+    """
+    with zipfile.ZipFile(file_path) as archive:
+        with archive.open("word/document.xml") as document:
+            body = None
+            depth = 0
+            paragraph_depth = 0
+            for event, element in ET.iterparse(document, events=("start", "end")):
+                if event == "start":
+                    depth += 1
+                    if element.tag == f"{_W}body":
+                        body = element
+                    elif element.tag == f"{_W}p":
+                        paragraph_depth += 1
+                    continue
+
+                depth -= 1
+                if element.tag == f"{_W}p":
+                    paragraph_depth -= 1
+                    # text boxes nest paragraphs; yield the outermost one only
+                    if paragraph_depth == 0:
+                        yield _paragraph_text(element)
+                # document > body > paragraph/table: drop finished blocks
+                if depth == 2 and body is not None:
+                    body.clear()
+
+
+def _paragraph_text(paragraph: ET.Element) -> str:
+    parts = []
+    for node in paragraph.iter():
+        if node.tag == f"{_W}t":
+            parts.append(node.text or "")
+        elif node.tag == f"{_W}tab":
+            parts.append("\t")
+        elif node.tag in (f"{_W}br", f"{_W}cr"):
+            parts.append("\n")
+    return "".join(parts)
 
 
 class DocumentProcessor:
-    def __init__(self, file_path: str):
-        """Initialize with validated file path."""
+    def __init__(self, file_path: str, pdf_workers: Optional[int] = None):
+        """Initialize with validated file path.
+
+        ``pdf_workers`` > 1 parses large PDFs page-range by page-range in that
+        many processes; it defaults to ``PDF_PARSE_WORKERS``.
+        """
         self.file_path = file_path
+        self.pdf_workers = pdf_workers or config.PDF_PARSE_WORKERS
 
     def validate_file(self) -> APIResponse | None:
         try:
@@ -24,8 +156,12 @@ class DocumentProcessor:
             response = APIResponse(success=False, code=400, message=message, data=None)
             return response
 
-    def extract_text(self) -> APIResponse:
-        """Extract text from the document and return structured response."""
+    def extract_text(self, inline: bool = True) -> APIResponse:
+        """Extract text from the document and return structured response.
+
+        With ``inline=False`` the text is streamed into a file under
+        ``SPOOL_DIR`` and returned as ``content_path``; the caller owns the file.
+        """
         # If validation failed, return the stored response
         validation_reponse = self.validate_file()
         if validation_reponse:
@@ -33,26 +169,32 @@ class DocumentProcessor:
 
         print("!!", self.file_path)
         ext = Path(self.file_path).suffix.lower()
-        loader_map = {".pdf": PyPDFLoader, ".txt": TextLoader, ".docx": Docx2txtLoader}
+        loader_map = {".pdf": PyPDFLoader}
 
         try:
-            loader = loader_map[ext](self.file_path)
-            docs = loader.load()
-            extracted_text = "\n".join([doc.page_content for doc in docs])
-
-            if not extracted_text.strip():
-                return APIResponse(
-                    success=False,
-                    code=204,
-                    message="No text found in document",
-                    data=None,
-                )
+            if not inline:
+                return self._spool_text(ext)
+            if ext == ".txt":
+                extracted_text = self._read_txt()
+            elif ext == ".pdf" and self.pdf_workers > 1:
+                extracted_text = self._read_pdf_parallel()
+            elif ext == ".docx":
+                extracted_text = "\n".join(iter_docx_paragraphs(self.file_path))
+            else:
+                loader = loader_map[ext](self.file_path)
+                docs = loader.load()
+                extracted_text = "\n".join(doc.page_content for doc in docs)
 
-            return APIResponse(
+            # isspace() avoids the full copy strip() would make
+            if not extracted_text or extracted_text.isspace():
+                return no_text_response()
+
+            # Built from our own extraction: skip re-validating the payload
+            return APIResponse.model_construct(
                 success=True,
                 code=200,
                 message="Text extracted successfully",
-                data=DocumentResponse(
+                data=DocumentResponse.model_construct(
                     file_path=str(self.file_path),
                     file_type=ext[1:],  # Remove the dot
                     content=extracted_text,
@@ -63,3 +205,119 @@ class DocumentProcessor:
             return APIResponse(
                 success=False, code=500, message="Error processing document", data=None
             )
+
+    def _spool_text(self, ext: str) -> APIResponse:
+        """Stream the extracted text to disk instead of building one string."""
+        handle, content_path = tempfile.mkstemp(suffix=".txt", dir=config.SPOOL_DIR)
+        if ext == ".pdf" and self.pdf_workers > 1:
+            pieces = self._iter_pdf_parallel()
+        else:
+            pieces = self.iter_text()
+        has_text = False
+        try:
+            with os.fdopen(handle, "w", encoding="utf-8") as spool:
+                for piece in pieces:
+                    has_text = has_text or (bool(piece) and not piece.isspace())
+                    spool.write(piece)
+        except BaseException:
+            os.unlink(content_path)
+            raise
+
+        if not has_text:
+            os.unlink(content_path)
+            return no_text_response()
+        return APIResponse.model_construct(
+            success=True,
+            code=200,
+            message="Text extracted successfully",
+            data=DocumentResponse.model_construct(
+                file_path=str(self.file_path),
+                file_type=ext[1:],
+                content_path=content_path,
+            ),
+        )
+
+    def _read_txt(self) -> str:
+        """Decode a TXT file straight from its mapping into a single string."""
+        with map_file(self.file_path) as view:
+            encoding = detect_bom(view[:4].tobytes()) or "utf-8"
+            try:
+                return str(view, encoding)
+            except UnicodeDecodeError:
+                pass
+        # Decode like iter_text, which only switches to the fallback codec from
+        # the first bad window on, so inline and spooled extraction agree.
+        return "".join(self.iter_text())
+
+    def _read_pdf_parallel(self) -> str:
+        """Shard page ranges across processes and join the text in page order."""
+        return "".join(self._iter_pdf_parallel())
+
+    def _iter_pdf_parallel(self) -> Iterator[str]:
+        """Yield page texts in page order, as ``iter_text`` does, from shards."""
+        with open_pdf(self.file_path) as reader:
+            page_count = len(reader.pages)
+        if page_count < config.PDF_PARALLEL_MIN_PAGES:
+            yield from _join_pages([extract_pdf_pages(self.file_path, 0, page_count)])
+            return
+
+        workers = min(self.pdf_workers, os.cpu_count() or 1)
+        # a few shards per worker keeps them busy when some pages are heavier
+        ranges = page_ranges(page_count, workers * PDF_SHARDS_PER_WORKER)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            # map() hands shards back in submission order, i.e. page order
+            shards = executor.map(
+                extract_pdf_pages,
+                [self.file_path] * len(ranges),
+                [start for start, _ in ranges],
+                [stop for _, stop in ranges],
+            )
+            yield from _join_pages(shards)
+
+    def iter_text(self, window_size: int = TEXT_WINDOW_SIZE) -> Iterator[str]:
+        """Yield the text of a document piece by piece.
+
+        TXT files are memory-mapped and decoded incrementally in windows of
+        about ``window_size`` bytes; DOCX files are streamed paragraph by
+        paragraph and PDF files page by page. Peak memory does not depend on
+        the file size (beyond what the PDF parser itself holds).
+        Feed the pieces to ``SummaryGenerator.generate_summary`` to chunk them
+        as they arrive; joined, they equal the ``extract_text`` content.
+        """
+        ext = Path(self.file_path).suffix.lower()
+        if ext == ".pdf":
+            pages = PyPDFLoader(self.file_path).lazy_load()
+            for index, page in enumerate(pages):
+                yield f"\n{page.page_content}" if index else page.page_content
+            return
+        if ext == ".docx":
+            for index, paragraph in enumerate(iter_docx_paragraphs(self.file_path)):
+                yield f"\n{paragraph}" if index else paragraph
+            return
+        if ext != ".txt":
+            raise ValueError(f"Unsupported file format: {ext}")
+
+        with map_file(self.file_path) as view:
+            encoding = detect_bom(view[:4].tobytes()) or "utf-8"
+            decoder = codecs.getincrementaldecoder(encoding)()
+            for offset in range(0, len(view), window_size):
+                final = offset + window_size >= len(view)
+                with view[offset : offset + window_size] as window:
+                    pending = decoder.getstate()[0]
+                    try:
+                        text = decoder.decode(window, final=final)
+                    except UnicodeDecodeError:
+                        # Bytes before this window decoded fine, so only switch
+                        # the codec from here on.
+                        logger.warning(
+                            "%s is not %s past byte %d, decoding as %s",
+                            self.file_path,
+                            encoding,
+                            offset,
+                            FALLBACK_ENCODING,
+                        )
+                        encoding = FALLBACK_ENCODING
+                        decoder = codecs.getincrementaldecoder(encoding)("replace")
+                        text = decoder.decode(pending + window.tobytes(), final=final)
+                if text:
+                    yield text
@@ -0,0 +1,200 @@
+import asyncio
+import socket
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+import anthropic
+import httpx
+import openai
+import requests
+from tenacity import RetryError
+
+from src.config.settings import ConfigSettings
+from src.utils.my_logging import setup_logger
+
+logger = setup_logger()
+config = ConfigSettings()
+
+TIMEOUT_ERRORS = (
+    requests.Timeout,
+    socket.timeout,
+    httpx.TimeoutException,
+    asyncio.TimeoutError,
+    # the SDKs wrap httpx timeouts in their own exceptions
+    openai.APITimeoutError,
+    anthropic.APITimeoutError,
+)
+# Weight of the newest sample in the short-term latency average.
+RECENT_LATENCY_SMOOTHING = 0.5
+
+
+def is_overload_error(error: BaseException) -> bool:
+    """True for 429 responses and timeouts, i.e. signs the provider is saturated."""
+    if isinstance(error, RetryError) and error.last_attempt.failed:
+        error = error.last_attempt.exception()
+    if isinstance(error, TIMEOUT_ERRORS):
+        return True
+    status = getattr(error, "status_code", None)
+    if status is None and isinstance(error, httpx.HTTPStatusError):
+        status = error.response.status_code
+    return status == 429
+
+
+class AdaptiveConcurrencyLimiter:
+    """AIMD limit on in-flight requests, after Netflix's concurrency-limits.
+
+    The limit grows by one for every on-time response while it is actually in
+    use, and shrinks by ``backoff_ratio`` on a 429, a timeout, or when the
+    short-term average latency exceeds ``latency_tolerance`` times the long-term
+    average over about ``latency_window`` requests (queueing upstream), as in
+    the gradient limit of concurrency-limits. Latency is taken per unit of
+    request ``size`` so that long chunks are not mistaken for slow ones.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 4,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        backoff_ratio: float = 0.9,
+        latency_tolerance: float = 2.0,
+        latency_window: int = 100,
+    ):
+        if not 1 <= min_limit <= initial_limit <= max_limit:
+            raise ValueError(
+                "Limits must satisfy 1 <= min_limit <= initial_limit <= max_limit"
+            )
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff_ratio = backoff_ratio
+        self.latency_tolerance = latency_tolerance
+        self._limit = float(initial_limit)
+        self._baseline_smoothing = 1 / latency_window
+        self._baseline_latency: Optional[float] = None
+        self._recent_latency: Optional[float] = None
+        self._in_flight = 0
+        self._condition = threading.Condition()
+        self.successes = 0
+        self.drops = 0
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def acquire(self, timeout: Optional[float] = None) -> int:
+        """Wait for a slot; returns the in-flight count including this request."""
+        with self._condition:
+            if not self._condition.wait_for(
+                lambda: self._in_flight < self.limit, timeout=timeout
+            ):
+                raise TimeoutError("No concurrency slot available")
+            self._in_flight += 1
+            return self._in_flight
+
+    def release(
+        self,
+        latency: Optional[float] = None,
+        dropped: bool = False,
+        in_flight: int = 1,
+        size: float = 1.0,
+    ) -> None:
+        """Free a slot and feed the request's outcome into the limit.
+
+        ``in_flight`` is what ``acquire`` returned; without a latency or a drop
+        the limit is left as is (e.g. errors unrelated to capacity). ``size``
+        is the request size in thousands of characters; smaller requests count
+        as one, since their latency is mostly fixed overhead.
+        """
+        with self._condition:
+            self._in_flight -= 1
+            if dropped:
+                self.drops += 1
+                self._decrease()
+            elif latency is not None:
+                self.successes += 1
+                self._on_success(latency / max(1.0, size), in_flight)
+            self._condition.notify_all()
+
+    @contextmanager
+    def slot(self, size: float = 1.0) -> Iterator[None]:
+        """Hold a slot for one provider call and feed back its outcome."""
+        in_flight = self.acquire()
+        started = time.monotonic()
+        try:
+            yield
+        except Exception as e:
+            if is_overload_error(e):
+                self.release(dropped=True)
+                logger.warning(
+                    "Provider overloaded, concurrency limit lowered to %d: %s",
+                    self.limit,
+                    e,
+                )
+            else:
+                # other errors say nothing about capacity
+                self.release()
+            raise
+        except BaseException:
+            self.release()
+            raise
+        self.release(time.monotonic() - started, in_flight=in_flight, size=size)
+
+    def _on_success(self, latency: float, in_flight: int) -> None:
+        if self._baseline_latency is None:
+            self._baseline_latency = self._recent_latency = latency
+        self._recent_latency += RECENT_LATENCY_SMOOTHING * (
+            latency - self._recent_latency
+        )
+        self._baseline_latency += self._baseline_smoothing * (
+            latency - self._baseline_latency
+        )
+        if self._recent_latency > self.latency_tolerance * self._baseline_latency:
+            self._decrease()
+        elif in_flight * 2 >= self._limit:
+            # only grow while the current limit is actually being used
+            self._limit = min(self.max_limit, self._limit + 1)
+
+    def _decrease(self) -> None:
+        self._limit = max(self.min_limit, self._limit * self.backoff_ratio)
+
+    def metrics(self) -> Dict[str, float]:
+        with self._condition:
+            return {
+                "limit": self.limit,
+                "in_flight": self._in_flight,
+                "recent_latency": self._recent_latency,
+                "baseline_latency": self._baseline_latency,
+                "successes": self.successes,
+                "drops": self.drops,
+            }
+
+
+_limiters: Dict[str, AdaptiveConcurrencyLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_limiter(provider: str) -> AdaptiveConcurrencyLimiter:
+    """Return the limiter shared by every model of ``provider``."""
+    with _limiters_lock:
+        if provider not in _limiters:
+            _limiters[provider] = AdaptiveConcurrencyLimiter(
+                initial_limit=config.ADAPTIVE_INITIAL_LIMIT,
+                min_limit=config.ADAPTIVE_MIN_LIMIT,
+                max_limit=config.ADAPTIVE_MAX_LIMIT,
+                backoff_ratio=config.ADAPTIVE_BACKOFF_RATIO,
+                latency_tolerance=config.ADAPTIVE_LATENCY_TOLERANCE,
+            )
+        return _limiters[provider]
+
+
+def concurrency_metrics() -> Dict[str, Dict[str, float]]:
+    """Current limit and counters for every provider, e.g. for a metrics endpoint."""
+    with _limiters_lock:
+        limiters = dict(_limiters)
+    return {provider: limiter.metrics() for provider, limiter in limiters.items()}
@@ -0,0 +1,284 @@
+import sqlite3
+import threading
+import time
+import uuid
+from typing import List, Optional
+
+from src.config.settings import ConfigSettings
+from src.models.schemas import APIResponse, SummaryResponse
+from src.services.summary import SummaryGenerator
+from src.utils.my_logging import setup_logger
+
+logger = setup_logger()
+config = ConfigSettings()
+
+# Job lifecycle: queued -> running -> success | partial | error, or cancelled.
+ACTIVE_STATES = ("queued", "running")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    priority INTEGER NOT NULL DEFAULT 0,
+    summary_type TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS chunks (
+    job_id TEXT NOT NULL REFERENCES jobs(id),
+    idx INTEGER NOT NULL,
+    text TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    result TEXT,
+    error TEXT,
+    PRIMARY KEY (job_id, idx)
+);
+CREATE INDEX IF NOT EXISTS jobs_queue ON jobs(status, priority DESC, created_at);
+"""
+
+
+class JobStore:
+    """SQLite-backed summarization jobs with per-chunk progress.
+
+    Every chunk result is committed as soon as it arrives, so a job picked up
+    again after a crash only calls the model for the chunks still pending.
+    """
+
+    def __init__(self, db_path: Optional[str] = None):
+        self.db_path = db_path or config.JOB_DB_PATH
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            self.db_path, isolation_level=None, check_same_thread=False
+        )
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def submit(
+        self, chunks: List[str], summary_type: str = "brief", priority: int = 0
+    ) -> str:
+        """Persist a job with its chunks and return the job id."""
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(
+                    "INSERT INTO jobs (id, status, priority, summary_type, "
+                    "created_at, updated_at) VALUES (?, 'queued', ?, ?, ?, ?)",
+                    (job_id, priority, summary_type, now, now),
+                )
+                self._conn.executemany(
+                    "INSERT INTO chunks (job_id, idx, text) VALUES (?, ?, ?)",
+                    [(job_id, idx, chunk) for idx, chunk in enumerate(chunks)],
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return job_id
+
+    def claim_next(self) -> Optional[sqlite3.Row]:
+        """Mark the highest-priority queued job as running and return it."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                job = self._conn.execute(
+                    "SELECT * FROM jobs WHERE status = 'queued' "
+                    "ORDER BY priority DESC, created_at LIMIT 1"
+                ).fetchone()
+                if job is not None:
+                    self._conn.execute(
+                        "UPDATE jobs SET status = 'running', updated_at = ? "
+                        "WHERE id = ?",
+                        (time.time(), job["id"]),
+                    )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return job
+
+    def requeue_running(self) -> int:
+        """Put jobs left running by a dead process back in the queue."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status = 'queued', updated_at = ? "
+                "WHERE status = 'running'",
+                (time.time(),),
+            )
+        return cursor.rowcount
+
+    def pending_chunks(self, job_id: str) -> List[sqlite3.Row]:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT idx, text FROM chunks WHERE job_id = ? AND status = 'pending' "
+                "ORDER BY idx",
+                (job_id,),
+            ).fetchall()
+
+    def record_chunk(
+        self,
+        job_id: str,
+        idx: int,
+        result: Optional[str] = None,
+        error: Optional[str] = None,
+    ) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE chunks SET status = ?, result = ?, error = ? "
+                "WHERE job_id = ? AND idx = ?",
+                ("done" if error is None else "error", result, error, job_id, idx),
+            )
+
+    def finish(self, job_id: str) -> str:
+        """Set the final status from the chunk outcomes, unless cancelled."""
+        with self._lock:
+            counts = dict(
+                self._conn.execute(
+                    "SELECT status, COUNT(*) FROM chunks WHERE job_id = ? "
+                    "GROUP BY status",
+                    (job_id,),
+                ).fetchall()
+            )
+            if counts.get("error"):
+                status = "partial" if counts.get("done") else "error"
+            else:
+                status = "success"
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, updated_at = ? "
+                "WHERE id = ? AND status = 'running'",
+                (status, time.time(), job_id),
+            )
+        return status
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a queued or running job; a running job stops at its next chunk."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status = 'cancelled', updated_at = ? "
+                "WHERE id = ? AND status IN (?, ?)",
+                (time.time(), job_id, *ACTIVE_STATES),
+            )
+        return cursor.rowcount == 1
+
+    def job_state(self, job_id: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT status FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        return row["status"] if row else None
+
+    def status(self, job_id: str) -> APIResponse:
+        """Report a job with the same payload as ``generate_summary``."""
+        with self._lock:
+            job = self._conn.execute(
+                "SELECT * FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+            chunks = self._conn.execute(
+                "SELECT status, result, error FROM chunks WHERE job_id = ? "
+                "ORDER BY idx",
+                (job_id,),
+            ).fetchall()
+        if job is None:
+            return APIResponse(
+                success=False, code=404, message="Job not found", data=None
+            )
+
+        results = [chunk["result"] for chunk in chunks if chunk["status"] == "done"]
+        errors = [chunk["error"] for chunk in chunks if chunk["status"] == "error"]
+        summary = "\n".join(results) if results else None
+        done = len(results) + len(errors)
+
+        if job["status"] in ACTIVE_STATES:
+            return APIResponse(
+                success=True,
+                code=202,
+                message=f"Job {job['status']}: {done}/{len(chunks)} chunks done.",
+                data=SummaryResponse(status="partial", summary=summary),
+            )
+        if job["status"] == "success":
+            return APIResponse(
+                success=True,
+                code=200,
+                message="Summarization successfully.",
+                data=SummaryResponse(status="success", summary=summary),
+            )
+        if job["status"] == "partial":
+            return APIResponse(
+                success=True,
+                code=206,
+                message="/n".join(errors),
+                data=SummaryResponse(status="partial", summary=summary),
+            )
+        if job["status"] == "cancelled":
+            message = "Job cancelled"
+        else:
+            message = "/n".join(errors) or "Error generating summary"
+        return APIResponse(
+            success=False,
+            code=500,
+            message=message,
+            data=SummaryResponse(status="error", summary=summary),
+        )
+
+
+class JobRunner:
+    """Work through queued jobs one chunk at a time."""
+
+    def __init__(self, store: JobStore, summarizer: SummaryGenerator):
+        self.store = store
+        self.summarizer = summarizer
+
+    def submit(self, text: str, summary_type: str = "brief", priority: int = 0) -> str:
+        chunks = self.summarizer.chunk_text(text)
+        return self.store.submit(
+            self.summarizer.compress_chunks(text, chunks), summary_type, priority
+        )
+
+    def recover(self) -> int:
+        """Requeue jobs interrupted by a restart; call once before running."""
+        requeued = self.store.requeue_running()
+        if requeued:
+            logger.info("Requeued %d interrupted summarization jobs", requeued)
+        return requeued
+
+    def run_next(self) -> Optional[str]:
+        """Process the next queued job and return its id, or None if idle."""
+        job = self.store.claim_next()
+        if job is None:
+            return None
+
+        job_id = job["id"]
+        for chunk in self.store.pending_chunks(job_id):
+            if self.store.job_state(job_id) == "cancelled":
+                logger.info("Job %s cancelled", job_id)
+                return job_id
+            try:
+                result = self.summarizer.summarize_chunk(
+                    chunk["text"], job["summary_type"]
+                )
+                self.store.record_chunk(job_id, chunk["idx"], result=result)
+            except Exception as e:
+                logger.error(
+                    "Error summarizing chunk %d of %s: %s", chunk["idx"], job_id, e
+                )
+                self.store.record_chunk(
+                    job_id, chunk["idx"], error=str(e) or type(e).__name__
+                )
+
+        self.store.finish(job_id)
+        return job_id
+
+    def run_until_empty(self) -> None:
+        while self.run_next() is not None:
+            pass
+
+    def run_forever(self, poll_interval: float = 1.0) -> None:
+        self.recover()
+        while True:
+            if self.run_next() is None:
+                time.sleep(poll_interval)
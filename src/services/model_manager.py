@@ -1,15 +1,32 @@
 import asyncio
 import socket
+import threading
+import time
 from abc import ABC, abstractmethod
+from collections import Counter
+from contextlib import nullcontext
+from typing import Any, Callable, ContextManager, Dict, List, Optional
 
 import httpx
+import langid
 import requests
 from langchain_anthropic import ChatAnthropic
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
 from langchain_core.rate_limiters import InMemoryRateLimiter
 from langchain_openai import ChatOpenAI
 from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_fixed
 
 from src.config.settings import ConfigSettings
+from src.models.schemas import RoutingRule
+from src.services.concurrency import AdaptiveConcurrencyLimiter, get_limiter
+from src.services.prompts import (
+    ANTHROPIC_CACHE_MIN_TOKENS,
+    ANTHROPIC_HAIKU_CACHE_MIN_TOKENS,
+    OPENAI_CACHE_MIN_TOKENS,
+    PREFIX_SEPARATOR,
+    PromptCacheStats,
+    estimate_tokens,
+)
 from src.utils.my_logging import setup_logger
 
 logger = setup_logger()
@@ -19,39 +36,224 @@ config = ConfigSettings()
 class Model(ABC):
     """Abstract base class for AI models."""
 
+    # set by backends that report prompt-cache usage, with the shortest
+    # prefix (in tokens) their provider caches
+    prompt_cache: Optional[PromptCacheStats] = None
+    prompt_cache_min_tokens: Optional[int] = None
+    # set on backends whose provider calls are gated by adaptive concurrency
+    limiter: Optional[AdaptiveConcurrencyLimiter] = None
+
     @abstractmethod
     def generate_response(self, prompt: str) -> str:
         """Generate a response based on the given prompt."""
         pass
 
+    def generate_with_prefix(self, prefix: str, suffix: str) -> str:
+        """Generate from a prefix shared across requests and a per-request suffix.
+
+        Backends with prompt caching send the prefix so the provider can cache
+        it; by default both parts are sent as one prompt.
+        """
+        return self.generate_response(prefix + PREFIX_SEPARATOR + suffix)
+
+    def _slot(self, *prompt: str) -> ContextManager[None]:
+        """Concurrency slot for a single provider call, sized by its prompt."""
+        if self.limiter is None:
+            return nullcontext()
+        return self.limiter.slot(size=sum(len(part) for part in prompt) / 1000)
+
+
+def _sdk_retries(limiter: Optional[AdaptiveConcurrencyLimiter]) -> Dict[str, int]:
+    """Client kwargs turning off the SDK's own retries under adaptive concurrency.
+
+    The SDKs retry 429s and timeouts internally with backoff, which would hide
+    them from the limiter and add the backoff to the measured latency; tenacity
+    retries instead, one timed attempt at a time.
+    """
+    return {"max_retries": 0} if limiter else {}
+
 
 class ModelManager:
     """Factory class to get the appropriate model based on configuration."""
 
     @staticmethod
-    def get_model(model_type) -> Model:
+    def get_model(model_type, model_name: Optional[str] = None) -> Model:
+        if model_type == "routing":
+            return RoutingModel.from_config()
+        # the adaptive limit replaces the static per-model rate limiter
+        limiter = get_limiter(model_type) if config.ADAPTIVE_CONCURRENCY else None
         if model_type == "openai":
-            return OpenAIModel()
+            return OpenAIModel(model_name, limiter)
         elif model_type == "anthropic":
-            return AnthropicModel()
+            return AnthropicModel(model_name, limiter)
         else:
             raise ValueError(f"Invalid model provider: {model_type}")
 
 
+class AdaptiveConcurrencyModel(Model):
+    """Gate any model's requests with an adaptive concurrency limit.
+
+    The built-in providers take the limiter directly so that only the provider
+    call itself is timed; this wrapper is for other ``Model`` implementations.
+    """
+
+    def __init__(self, model: Model, limiter: AdaptiveConcurrencyLimiter):
+        self.model = model
+        self.limiter = limiter
+
+    @property
+    def prompt_cache(self) -> Optional[PromptCacheStats]:
+        return self.model.prompt_cache
+
+    def generate_response(self, prompt: str) -> str:
+        return self._call(self.model.generate_response, prompt)
+
+    def generate_with_prefix(self, prefix: str, suffix: str) -> str:
+        return self._call(self.model.generate_with_prefix, prefix, suffix)
+
+    def _call(self, generate: Callable[..., str], *prompt: str) -> str:
+        with self._slot(*prompt):
+            return generate(*prompt)
+
+
+class RoutingModel(Model):
+    """Pick a model per chunk from its length, language and summary type.
+
+    Rules are tried in order and the first match names the target; chunks no
+    rule matches go to ``default``. Cheap chunks (tables of contents, short
+    boilerplate, plain prose) can then go to a fast model and the rest to a
+    strong one. ``stats`` reports the decisions with latency and estimated cost.
+    """
+
+    def __init__(
+        self,
+        models: Dict[str, Model],
+        rules: List[RoutingRule],
+        default: str,
+        costs: Optional[Dict[str, float]] = None,
+    ):
+        unknown = ({rule.target for rule in rules} | {default}) - set(models)
+        if unknown:
+            raise ValueError(f"Unknown routing targets: {sorted(unknown)}")
+        self.models = models
+        self.rules = rules
+        self.default = default
+        self.costs = costs or {}
+        self._detect_language = any(rule.languages for rule in rules)
+        self._lock = threading.Lock()
+        self._decisions: Counter = Counter()
+        self._stats = {
+            name: {
+                "calls": 0,
+                "errors": 0,
+                "prompt_chars": 0,
+                "latency_seconds": 0.0,
+                "estimated_cost": 0.0,
+            }
+            for name in models
+        }
+
+    @classmethod
+    def from_config(cls) -> "RoutingModel":
+        targets = config.ROUTING_TARGETS
+        return cls(
+            models={
+                name: ModelManager.get_model(target.provider, target.model)
+                for name, target in targets.items()
+            },
+            rules=config.ROUTING_RULES,
+            default=config.ROUTING_DEFAULT_TARGET,
+            costs={name: target.cost_per_1k_tokens for name, target in targets.items()},
+        )
+
+    def route(self, chunk: str, summary_type: Optional[str] = None) -> str:
+        """Return the name of the target model for ``chunk``."""
+        language = langid.classify(chunk)[0] if self._detect_language else None
+        for index, rule in enumerate(self.rules):
+            if rule.matches(len(chunk), language, summary_type):
+                with self._lock:
+                    self._decisions[f"rule {index} -> {rule.target}"] += 1
+                return rule.target
+        with self._lock:
+            self._decisions[f"default -> {self.default}"] += 1
+        return self.default
+
+    def generate_response(self, prompt: str) -> str:
+        return self.generate_routed(prompt, prompt)
+
+    def generate_with_prefix(self, prefix: str, suffix: str) -> str:
+        return self.generate_routed(suffix, suffix, prefix=prefix)
+
+    def generate_routed(
+        self,
+        prompt: str,
+        chunk: str,
+        summary_type: Optional[str] = None,
+        prefix: Optional[str] = None,
+    ) -> str:
+        """Route on the bare ``chunk`` and send the full ``prompt``.
+
+        With a ``prefix``, ``prompt`` is the per-chunk suffix and the target
+        gets both parts, so it can cache the prefix.
+        """
+        target = self.route(chunk, summary_type)
+        model = self.models[target]
+        started = time.monotonic()
+        try:
+            if prefix is None:
+                return model.generate_response(prompt)
+            return model.generate_with_prefix(prefix, prompt)
+        except Exception:
+            with self._lock:
+                self._stats[target]["errors"] += 1
+            raise
+        finally:
+            with self._lock:
+                stats = self._stats[target]
+                stats["calls"] += 1
+                prompt_chars = len(prompt) + len(prefix or "")
+                stats["prompt_chars"] += prompt_chars
+                stats["latency_seconds"] += time.monotonic() - started
+                # roughly four characters per token
+                stats["estimated_cost"] += (
+                    prompt_chars / 4000 * self.costs.get(target, 0.0)
+                )
+
+    def stats(self) -> Dict[str, dict]:
+        with self._lock:
+            targets = {name: dict(stats) for name, stats in self._stats.items()}
+        for name, model in self.models.items():
+            if model.prompt_cache is not None:
+                targets[name]["prompt_cache"] = model.prompt_cache.metrics()
+        return {"decisions": dict(self._decisions), "targets": targets}
+
+
 class OpenAIModel(Model):
     """OpenAI model integration."""
 
-    def __init__(self):
-        self.rate_limiter = InMemoryRateLimiter(
-            requests_per_second=config.REQUESTS_PER_SECOND,
-            check_every_n_seconds=config.CHECK_EVERY_N_SECONDS,
-            max_bucket_size=config.MAX_BUCKET_SIZE,
+    def __init__(
+        self,
+        model_name: Optional[str] = None,
+        limiter: Optional[AdaptiveConcurrencyLimiter] = None,
+    ):
+        self.limiter = limiter
+        self.rate_limiter = (
+            None
+            if limiter
+            else InMemoryRateLimiter(
+                requests_per_second=config.REQUESTS_PER_SECOND,
+                check_every_n_seconds=config.CHECK_EVERY_N_SECONDS,
+                max_bucket_size=config.MAX_BUCKET_SIZE,
+            )
         )
         self.model = ChatOpenAI(
-            model=config.OPENAI_MODEL,
+            model=model_name or config.OPENAI_MODEL,
             api_key=config.OPENAI_API_KEY.get_secret_value(),
             rate_limiter=self.rate_limiter,
+            **_sdk_retries(limiter),
         )
+        self.prompt_cache = PromptCacheStats()
+        self.prompt_cache_min_tokens = OPENAI_CACHE_MIN_TOKENS
 
     @retry(
         stop=stop_after_attempt(3),
@@ -60,7 +262,38 @@ class OpenAIModel(Model):
     )
     def generate_response(self, prompt: str) -> str:
         try:
-            return self.model.predict(prompt)
+            with self._slot(prompt):
+                return self.model.predict(prompt)
+        except (
+            requests.Timeout,
+            socket.timeout,
+            httpx.TimeoutException,
+            asyncio.TimeoutError,
+        ) as e:
+            logger.error("Timeout error: %s", e)
+            raise
+        except Exception as e:
+            logger.error("Model error: %s", e)
+            raise
+
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_fixed(0.1),
+        retry=retry_if_exception_type(Exception),
+    )
+    def generate_with_prefix(self, prefix: str, suffix: str) -> str:
+        """Send the prefix first, as the system message, so every chunk shares it.
+
+        OpenAI caches prompt prefixes of 1024 tokens or more automatically;
+        shorter prefixes are never cached.
+        """
+        messages: List[BaseMessage] = [
+            SystemMessage(content=prefix),
+            HumanMessage(content=suffix),
+        ]
+        try:
+            with self._slot(prefix, suffix):
+                response = self.model.invoke(messages)
         except (
             requests.Timeout,
             socket.timeout,
@@ -72,21 +305,40 @@ class OpenAIModel(Model):
         except Exception as e:
             logger.error("Model error: %s", e)
             raise
+        self.prompt_cache.record(response)
+        return response.content
 
 
 class AnthropicModel(Model):
     """Anthropic model integration."""
 
-    def __init__(self):
-        self.rate_limiter = InMemoryRateLimiter(
-            requests_per_second=config.REQUESTS_PER_SECOND,
-            check_every_n_seconds=config.CHECK_EVERY_N_SECONDS,
-            max_bucket_size=config.MAX_BUCKET_SIZE,
+    def __init__(
+        self,
+        model_name: Optional[str] = None,
+        limiter: Optional[AdaptiveConcurrencyLimiter] = None,
+    ):
+        self.limiter = limiter
+        self.rate_limiter = (
+            None
+            if limiter
+            else InMemoryRateLimiter(
+                requests_per_second=config.REQUESTS_PER_SECOND,
+                check_every_n_seconds=config.CHECK_EVERY_N_SECONDS,
+                max_bucket_size=config.MAX_BUCKET_SIZE,
+            )
         )
+        model_name = model_name or config.ANTHROPIC_MODEL
         self.model = ChatAnthropic(
-            model=config.ANTHROPIC_MODEL,
+            model=model_name,
             api_key=config.ANTHROPIC_API_KEY.get_secret_value(),  # Fixed API key reference
             rate_limiter=self.rate_limiter,
+            **_sdk_retries(limiter),
+        )
+        self.prompt_cache = PromptCacheStats()
+        self.prompt_cache_min_tokens = (
+            ANTHROPIC_HAIKU_CACHE_MIN_TOKENS
+            if "haiku" in model_name
+            else ANTHROPIC_CACHE_MIN_TOKENS
         )
 
     @retry(
@@ -96,7 +348,41 @@ class AnthropicModel(Model):
     )
     def generate_response(self, prompt: str) -> str:
         try:
-            return self.model.predict(prompt)
+            with self._slot(prompt):
+                return self.model.predict(prompt)
+        except (
+            requests.Timeout,
+            socket.timeout,
+            httpx.TimeoutException,
+            asyncio.TimeoutError,
+        ) as e:
+            logger.error("Timeout error: %s", e)
+            raise
+        except Exception as e:
+            logger.error("Model error: %s", e)
+            raise
+
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_fixed(2),
+        retry=retry_if_exception_type(Exception),
+    )
+    def generate_with_prefix(self, prefix: str, suffix: str) -> str:
+        """Mark the prefix as a cache breakpoint if it is long enough to be cached.
+
+        Anthropic ignores the marker below its minimum length, so shorter
+        prefixes are sent as a plain system block.
+        """
+        system: Dict[str, Any] = {"type": "text", "text": prefix}
+        if estimate_tokens(prefix) >= self.prompt_cache_min_tokens:
+            system["cache_control"] = {"type": "ephemeral"}
+        messages: List[BaseMessage] = [
+            SystemMessage(content=[system]),
+            HumanMessage(content=suffix),
+        ]
+        try:
+            with self._slot(prefix, suffix):
+                response = self.model.invoke(messages)
         except (
             requests.Timeout,
             socket.timeout,
@@ -108,3 +394,5 @@ class AnthropicModel(Model):
         except Exception as e:
             logger.error("Model error: %s", e)
             raise
+        self.prompt_cache.record(response)
+        return response.content
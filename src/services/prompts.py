@@ -0,0 +1,113 @@
+import re
+import threading
+from typing import Any, Dict, Optional
+
+from src.models.schemas import PromptParts
+
+# Heading-like lines: markdown headings, numbered sections ("2.1 Scope"), roman
+# numerals ("IV. Results") or short all-caps lines.
+_HEADING_RE = re.compile(
+    r"^(?:#{1,6}\s+\S.*|(?:\d+(?:\.\d+)*\.?|[IVXLC]+\.)\s+[A-Z].*|[A-Z][A-Z0-9 ,&/-]+)$"
+)
+HEADING_MAX_CHARS = 80
+
+# Worded to hold whether the chunk comes as a second message or further down
+# the same prompt.
+_SECTION_NOTE = (
+    "The text to work on is one section of a longer document and is given "
+    "after these instructions."
+)
+PREFIX_SEPARATOR = "\n\n"
+
+# Providers only cache prompts from a minimum length on: 1024 tokens for OpenAI
+# and Claude Sonnet/Opus, 2048 for Claude Haiku. Shorter prefixes are billed in
+# full on every request.
+OPENAI_CACHE_MIN_TOKENS = 1024
+ANTHROPIC_CACHE_MIN_TOKENS = 1024
+ANTHROPIC_HAIKU_CACHE_MIN_TOKENS = 2048
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // CHARS_PER_TOKEN
+
+
+def instruction_from_template(template: str) -> str:
+    """Turn a ``{text}`` template into a standalone instruction."""
+    return " ".join(template.replace("{text}", "").split())
+
+
+def document_outline(text: str, max_chars: int) -> Optional[str]:
+    """Collect the document's heading-like lines, up to ``max_chars``."""
+    headings = []
+    size = 0
+    for line in text.splitlines():
+        line = line.strip()
+        if (
+            not line
+            or len(line) > HEADING_MAX_CHARS
+            or line.endswith((".", ",", ";"))
+            or not _HEADING_RE.match(line)
+        ):
+            continue
+        if size + len(line) + 1 > max_chars:
+            break
+        headings.append(line)
+        size += len(line) + 1
+    return "\n".join(headings) or None
+
+
+def build_prompt(
+    instruction: str, chunk: str, context: Optional[str] = None
+) -> PromptParts:
+    """Split a request into a prefix shared by every chunk and the chunk itself.
+
+    The prefix only depends on the summary type and the document, never on the
+    chunk, so providers can serve it from their prompt cache after the first
+    request of a document, provided it reaches their minimum cacheable length.
+    The instruction alone does not; a sizeable outline or glossary does.
+    """
+    prefix = instruction
+    if context:
+        prefix += f"\n\nDocument outline and glossary:\n{context}"
+    prefix += f"\n\n{_SECTION_NOTE}"
+    return PromptParts(prefix=prefix, suffix=chunk)
+
+
+class PromptCacheStats:
+    """Prompt-cache usage as reported by the provider for each response."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.hits = 0
+        self.input_tokens = 0
+        self.cache_read_tokens = 0
+        self.cache_creation_tokens = 0
+
+    def record(self, message: Any) -> None:
+        """Add the ``usage_metadata`` of a chat model response."""
+        usage = getattr(message, "usage_metadata", None) or {}
+        details = usage.get("input_token_details") or {}
+        cache_read = details.get("cache_read") or 0
+        with self._lock:
+            self.requests += 1
+            self.hits += cache_read > 0
+            self.input_tokens += usage.get("input_tokens") or 0
+            self.cache_read_tokens += cache_read
+            self.cache_creation_tokens += details.get("cache_creation") or 0
+
+    def metrics(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "hits": self.hits,
+                "input_tokens": self.input_tokens,
+                "cache_read_tokens": self.cache_read_tokens,
+                "cache_creation_tokens": self.cache_creation_tokens,
+                "hit_ratio": (
+                    self.cache_read_tokens / self.input_tokens
+                    if self.input_tokens
+                    else 0.0
+                ),
+            }
@@ -1,87 +1,256 @@
 import asyncio
 import socket
-from typing import List
+from typing import Iterable, Iterator, List, Optional, Set, Tuple, Union
 
 import httpx
 import requests
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 
 from src.config.settings import ConfigSettings
-from src.models.schemas import APIResponse, SummaryResponse
-from src.services.model_manager import ModelManager, Model
+from src.models.schemas import APIResponse, PromptParts, SummaryResponse
+from src.processors.chunking import ContentDefinedChunker
+from src.processors.compression import SentenceCompressor
+from src.services.model_manager import ModelManager, Model, RoutingModel
+from src.services.prompts import (
+    build_prompt,
+    document_outline,
+    estimate_tokens,
+    instruction_from_template,
+)
 from src.utils.my_logging import setup_logger
 
 logger = setup_logger()
 config = ConfigSettings()
 
+# How many chunks worth of streamed text to buffer before splitting it.
+STREAM_BUFFER_CHUNKS = 64
+RECURSIVE_SEPARATORS = ["\n\n", "\n", " "]
+
+PROMPT_TEMPLATES = {
+    "brief": """Provide a short and concise \
+                    summary of the following text: {text}""",
+    "detailed": """Provide a detailed and comprehensive summary \
+                    of the following text: {text}""",
+    "bullet points": """Summarize the following text \
+                        in bullet points: {text}""",
+    "technical": """Provide a technical summary focusing on \
+                    key concepts and terminologies: {text}""",
+    "layman": """Explain the following text in a simple manner suitable \
+                    for a general audience: {text}""",
+}
+
 
 class SummaryGenerator:
-    def __init__(self, model: Model):
+    def __init__(
+        self,
+        model: Model,
+        chunk_strategy: Optional[str] = None,
+        compression_ratio: Optional[float] = None,
+        compression_method: Optional[str] = None,
+        prompt_caching: Optional[bool] = None,
+    ):
         self.model = model
+        self.chunk_strategy = chunk_strategy or config.CHUNK_STRATEGY
+        self.compression_ratio = compression_ratio or config.COMPRESSION_RATIO
+        self.compression_method = compression_method or config.COMPRESSION_METHOD
+        self.prompt_caching = (
+            config.PROMPT_CACHING if prompt_caching is None else prompt_caching
+        )
 
     def chunk_text(self, text: str) -> List[str]:
         # would be better if identify language type
         try:
-            chunk_size = config.CHUNK_SIZE
-            chunk_overlap = config.CHUNK_OVERLAP
-            splitter = RecursiveCharacterTextSplitter(
-                chunk_size=chunk_size,
-                chunk_overlap=chunk_overlap,
-                separators=["\n\n", "\n", " ", ""],
-            )
+            if self.chunk_strategy == "content_defined":
+                # boundaries follow the content, so chunk-keyed caches survive edits
+                splitter = ContentDefinedChunker(
+                    target_size=config.CHUNK_SIZE,
+                    min_size=config.CHUNK_MIN_SIZE,
+                    max_size=config.CHUNK_MAX_SIZE,
+                )
+            elif self.chunk_strategy == "recursive":
+                splitter = RecursiveCharacterTextSplitter(
+                    chunk_size=config.CHUNK_SIZE,
+                    chunk_overlap=config.CHUNK_OVERLAP,
+                    separators=[*RECURSIVE_SEPARATORS, ""],
+                )
+            else:
+                raise ValueError(f"Invalid chunk strategy: {self.chunk_strategy}")
             return splitter.split_text(text)
         except Exception as e:
             logger.error("Error while chunking text: %s", e)
             raise e
 
+    def chunk_stream(self, windows: Iterable[str]) -> Iterator[str]:
+        """Chunk text that arrives in windows (see ``DocumentProcessor.iter_text``)."""
+        if self.chunk_strategy == "content_defined":
+            yield from ContentDefinedChunker(
+                target_size=config.CHUNK_SIZE,
+                min_size=config.CHUNK_MIN_SIZE,
+                max_size=config.CHUNK_MAX_SIZE,
+            ).iter_chunks(windows)
+            return
+
+        # Split a bounded buffer and carry its tail over from the start of a
+        # paragraph, so the chunks match chunk_text unless a paragraph is longer
+        # than the buffer.
+        buffer = ""
+        for window in windows:
+            buffer += window
+            if len(buffer) < STREAM_BUFFER_CHUNKS * config.CHUNK_SIZE:
+                continue
+            chunks = self.chunk_text(buffer)
+            if not chunks:
+                buffer = ""
+                continue
+            index, offset = self._stream_restart(buffer, chunks)
+            yield from chunks[:index]
+            buffer = buffer[offset:]
+        if buffer:
+            yield from self.chunk_text(buffer)
+
+    @staticmethod
+    def _stream_restart(buffer: str, chunks: List[str]) -> Tuple[int, int]:
+        """Pick where to re-split a streamed buffer: ``(chunk index, offset)``.
+
+        The recursive splitter merges pieces cut at its coarsest separator, so a
+        chunk that starts right after one (with the overlap it carries) is split
+        the same way whatever came before it.
+        """
+        starts = []
+        offset = -1
+        for chunk in chunks:
+            offset = buffer.find(chunk, offset + 1)
+            starts.append(offset)
+        separator = next((sep for sep in RECURSIVE_SEPARATORS if sep in buffer), "")
+        # the last chunk may still grow, so it is never a restart point
+        for index in range(len(chunks) - 2, 0, -1):
+            gap_start = len(buffer[: starts[index]].rstrip())
+            gap = buffer[gap_start : starts[index]]
+            if separator in gap:
+                return index, gap_start + gap.rfind(separator)
+        # a paragraph longer than the buffer: cut it at its last chunk
+        return len(chunks) - 1, starts[-1]
+
+    def compress_chunks(self, text: str, chunks: List[str]) -> List[str]:
+        """Drop low-information sentences locally to save prompt tokens."""
+        if self.compression_ratio >= 1:
+            return chunks
+        compressor = SentenceCompressor(
+            self.compression_ratio, self.compression_method
+        ).fit(text)
+        compressed = compressor.compress_chunks(chunks)
+        logger.info(
+            "Compressed %d chunks from %d to %d characters",
+            len(chunks),
+            sum(len(chunk) for chunk in chunks),
+            sum(len(chunk) for chunk in compressed),
+        )
+        return compressed
+
+    def compress_stream(self, windows: Iterable[str]) -> Iterator[str]:
+        """Chunk streamed text and compress the chunks as they are produced.
+
+        IDF weights need the whole document, so they are learned on a first
+        pass over ``windows``; that takes a source that can be iterated again
+        (e.g. ``ContentStream``). A one-shot iterator is chunked uncompressed.
+        """
+        if self.compression_ratio >= 1:
+            yield from self.chunk_stream(windows)
+            return
+        if iter(windows) is windows:
+            logger.warning(
+                "COMPRESSION_RATIO is ignored for streamed input that can only be "
+                "read once; pass a re-iterable source to compress it"
+            )
+            yield from self.chunk_stream(windows)
+            return
+        compressor = SentenceCompressor(
+            self.compression_ratio, self.compression_method
+        ).fit_stream(windows)
+        seen: Set[str] = set()
+        for chunk in self.chunk_stream(windows):
+            yield compressor.compress(chunk, seen)
+
     def get_prompt(self, summary_type: str) -> str:
         # can create PromptManager
-        templates = {
-            "brief": """Provide a short and concise \
-                    summary of the following text: {text}""",
-            "detailed": """Provide a detailed and comprehensive summary \
-                    of the following text: {text}""",
-            "bullet points": """Summarize the following text \
-                        in bullet points: {text}""",
-            "technical": """Provide a technical summary focusing on \
-                    key concepts and terminologies: {text}""",
-            "layman": """Explain the following text in a simple manner suitable \
-                    for a general audience: {text}""",
-        }
-        return templates.get(summary_type, "")
+        return PROMPT_TEMPLATES.get(summary_type, "")
+
+    def build_prompt(
+        self, chunk: str, summary_type: str = "brief", context: Optional[str] = None
+    ) -> PromptParts:
+        """Split the prompt into a prefix shared by all chunks and the chunk."""
+        instruction = instruction_from_template(self.get_prompt(summary_type))
+        return build_prompt(instruction, chunk, context)
 
-    def generate_summary(self, text: str, summary_type: str = "brief") -> str:
+    def summarize_chunk(
+        self, chunk: str, summary_type: str = "brief", context: Optional[str] = None
+    ) -> str:
+        if self.prompt_caching or context:
+            parts = self.build_prompt(chunk, summary_type, context)
+            if isinstance(self.model, RoutingModel):
+                return self.model.generate_routed(
+                    parts.suffix, chunk, summary_type, prefix=parts.prefix
+                )
+            return self.model.generate_with_prefix(parts.prefix, parts.suffix)
+        prompt = self.get_prompt(summary_type).format(text=chunk)
+        if isinstance(self.model, RoutingModel):
+            return self.model.generate_routed(prompt, chunk, summary_type)
+        return self.model.generate_response(prompt)
 
+    def generate_summary(
+        self,
+        text: Union[str, Iterable[str]],
+        summary_type: str = "brief",
+        context: Optional[str] = None,
+    ) -> APIResponse:
+        """Summarize ``text``, given whole or as an iterable of decoded windows.
+
+        ``context`` (an outline or glossary) is sent with every chunk as part of
+        the cached prompt prefix. With prompt caching on and
+        ``PROMPT_OUTLINE_MAX_CHARS`` set, the outline defaults to the headings
+        of ``text``.
+        """
+        if (
+            context is None
+            and self.prompt_caching
+            and config.PROMPT_OUTLINE_MAX_CHARS > 0
+            and isinstance(text, str)
+        ):
+            context = document_outline(text, config.PROMPT_OUTLINE_MAX_CHARS)
+        if self.prompt_caching:
+            self._check_prefix_cacheable(summary_type, context)
         try:
-            chunks = self.chunk_text(text)
+            if isinstance(text, str):
+                chunks = self.compress_chunks(text, self.chunk_text(text))
+            else:
+                chunks = self.compress_stream(text)
         except Exception as e:
-            logger.error("Error while chunking text: %s", e)
-            return APIResponse(
-                success=False,
-                code=500,
-                message=str(e),
-                data=None,
-            )
+            return self._chunking_error(e)
         summary_results = []
         errors = []
 
-        for chunk in chunks:
-            prompt = self.get_prompt(summary_type).format(text=chunk)
-            try:
-                response = self.model.generate_response(prompt)
-                # response = f"####### This is the summarization {chunk}"
-                summary_results.append(response)
-            except (
-                requests.exceptions.Timeout,
-                socket.timeout,
-                httpx.TimeoutException,
-                asyncio.TimeoutError,
-            ) as e:
-                logger.warning("Timeout occurred: %s. Returning partial results.", e)
-                errors.append(f"Timeout error: {e}")
-            except Exception as e:
-                logger.error("Error generating summary: %s", e)
-                errors.append(f"Timeout error: {e}")
+        try:
+            for chunk in chunks:
+                try:
+                    response = self.summarize_chunk(chunk, summary_type, context)
+                    # response = f"####### This is the summarization {chunk}"
+                    summary_results.append(response)
+                except (
+                    requests.exceptions.Timeout,
+                    socket.timeout,
+                    httpx.TimeoutException,
+                    asyncio.TimeoutError,
+                ) as e:
+                    logger.warning(
+                        "Timeout occurred: %s. Returning partial results.", e
+                    )
+                    errors.append(f"Timeout error: {e}")
+                except Exception as e:
+                    logger.error("Error generating summary: %s", e)
+                    errors.append(f"Timeout error: {e}")
+        except Exception as e:
+            # streamed input is read and chunked lazily, inside the loop
+            return self._chunking_error(e)
 
         if summary_results:
             return APIResponse(
@@ -102,3 +271,28 @@ class SummaryGenerator:
                 message="Error generating summary",
                 data=None,
             )
+
+    def _check_prefix_cacheable(
+        self, summary_type: str, context: Optional[str]
+    ) -> None:
+        min_tokens = self.model.prompt_cache_min_tokens
+        if not isinstance(min_tokens, int):
+            return
+        prefix = self.build_prompt("", summary_type, context).prefix
+        if estimate_tokens(prefix) < min_tokens:
+            logger.info(
+                "Prompt prefix of about %d tokens is below the %d the provider "
+                "caches; add an outline or glossary to benefit from caching",
+                estimate_tokens(prefix),
+                min_tokens,
+            )
+
+    @staticmethod
+    def _chunking_error(error: Exception) -> APIResponse:
+        logger.error("Error while chunking text: %s", error)
+        return APIResponse(
+            success=False,
+            code=500,
+            message=str(error),
+            data=None,
+        )
@@ -0,0 +1,31 @@
+"""Synthetic PDFs for tests and benchmarks."""
+from pypdf import PdfWriter
+from pypdf.generic import DecodedStreamObject, DictionaryObject, NameObject
+
+
+def write_sample_pdf(file_path: str, pages: int, lines: int = 50) -> None:
+    """Write a PDF whose pages hold ``lines`` lines of Helvetica text."""
+    writer = PdfWriter()
+    font = DictionaryObject(
+        {
+            NameObject("/Type"): NameObject("/Font"),
+            NameObject("/Subtype"): NameObject("/Type1"),
+            NameObject("/BaseFont"): NameObject("/Helvetica"),
+        }
+    )
+    for number in range(pages):
+        page = writer.add_blank_page(612, 792)
+        page[NameObject("/Resources")] = DictionaryObject(
+            {NameObject("/Font"): DictionaryObject({NameObject("/F1"): font})}
+        )
+        operations = ["BT /F1 10 Tf 12 TL 40 760 Td"]
+        operations += [
+            f"(Page {number} line {line} revenue margin contract liability) '"
+            for line in range(lines)
+        ]
+        operations.append("ET")
+        content = DecodedStreamObject()
+        content.set_data("\n".join(operations).encode("latin-1"))
+        page.replace_contents(content)
+    with open(file_path, "wb") as handle:
+        writer.write(handle)
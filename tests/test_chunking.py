@@ -0,0 +1,146 @@
+import random
+
+import pytest
+
+from src.processors.chunking import ContentDefinedChunker
+from src.services.summary import SummaryGenerator, config
+
+WORDS = "alpha beta gamma delta epsilon zeta eta theta iota kappa lambda mu".split()
+
+
+def make_text(seed: int = 0, sentences: int = 400) -> str:
+    rng = random.Random(seed)
+    return " ".join(
+        " ".join(rng.choices(WORDS, k=rng.randint(5, 20))).capitalize() + "."
+        for _ in range(sentences)
+    )
+
+
+@pytest.fixture
+def chunker() -> ContentDefinedChunker:
+    return ContentDefinedChunker(target_size=500, min_size=100, max_size=1000)
+
+
+def test_offsets_cover_text(chunker):
+    """Spans are contiguous and reassemble the original text."""
+    text = make_text()
+    spans = chunker.split_offsets(text)
+
+    assert spans[0][0] == 0
+    assert spans[-1][1] == len(text)
+    assert all(a[1] == b[0] for a, b in zip(spans, spans[1:]))
+    assert "".join(text[start:end] for start, end in spans) == text
+
+
+def test_chunk_size_limits(chunker):
+    """Every chunk respects max_size and all but the last respect min_size."""
+    spans = chunker.split_offsets(make_text())
+    sizes = [end - start for start, end in spans]
+
+    assert max(sizes) <= chunker.max_size
+    assert min(sizes[:-1]) >= chunker.min_size
+
+
+def test_text_without_boundaries(chunker):
+    """Text with no sentence or whitespace break falls back to hard cuts."""
+    chunks = chunker.split_text("A" * 2500)
+
+    assert [len(chunk) for chunk in chunks] == [1000, 1000, 500]
+
+
+def test_paragraph_after_sentence_end_is_preferred(chunker, monkeypatch):
+    """A paragraph ending in punctuation still counts as a paragraph break."""
+    monkeypatch.setattr(chunker, "_is_cut", lambda *args: False)
+    first = make_text(sentences=20)[:600].rsplit(" ", 1)[0] + "."
+    text = first + "\n\n" + make_text(seed=1, sentences=40)
+
+    chunks = chunker.split_text(text)
+
+    assert chunks[0] == first
+
+
+def test_local_edit_keeps_other_chunks(chunker):
+    """Inserting a sentence in the middle only changes nearby chunks."""
+    text = make_text()
+    middle = text.index(". ", len(text) // 2) + 2
+    edited = text[:middle] + "Inserted sentence here. " + text[middle:]
+
+    before = chunker.split_text(text)
+    after = chunker.split_text(edited)
+
+    assert len(set(after) - set(before)) <= 2
+    assert after[0] == before[0]
+    assert after[-1] == before[-1]
+
+
+def test_invalid_sizes():
+    with pytest.raises(ValueError):
+        ContentDefinedChunker(target_size=100, min_size=200, max_size=300)
+
+
+def test_summary_generator_content_defined_strategy():
+    """SummaryGenerator picks the chunker from its strategy."""
+    text = make_text()
+    summarizer = SummaryGenerator(None, chunk_strategy="content_defined")
+
+    expected = ContentDefinedChunker(
+        target_size=config.CHUNK_SIZE,
+        min_size=config.CHUNK_MIN_SIZE,
+        max_size=config.CHUNK_MAX_SIZE,
+    ).split_text(text)
+    chunks = summarizer.chunk_text(text)
+
+    assert chunks == expected
+    assert len(chunks) > 1
+    assert all(len(chunk) <= config.CHUNK_MAX_SIZE for chunk in chunks)
+
+
+def test_summary_generator_invalid_strategy():
+    summarizer = SummaryGenerator(None, chunk_strategy="unknown")
+
+    with pytest.raises(ValueError, match="Invalid chunk strategy"):
+        summarizer.chunk_text("Some text.")
+
+
+def test_iter_chunks_matches_split_text(chunker):
+    """Streaming in uneven windows gives the same chunks as the whole text."""
+    text = make_text(seed=1)
+    rng = random.Random(2)
+    windows = []
+    offset = 0
+    while offset < len(text):
+        size = rng.randint(1, 3000)
+        windows.append(text[offset : offset + size])
+        offset += size
+
+    assert list(chunker.iter_chunks(windows)) == chunker.split_text(text)
+
+
+def test_iter_chunks_long_whitespace_run(chunker):
+    """A whitespace run longer than the lookahead does not move streamed cuts."""
+    text = "alpha beta gamma. " * 30 + "\n\n" + " " * 2500 + "delta epsilon. " * 30
+    windows = [text[i : i + 500] for i in range(0, len(text), 500)]
+
+    assert list(chunker.iter_chunks(windows)) == chunker.split_text(text)
+
+
+@pytest.mark.parametrize("strategy", ["recursive", "content_defined"])
+def test_summary_generator_chunk_stream(strategy):
+    """Windows streamed into the generator are chunked like the whole text."""
+    text = make_text(seed=3, sentences=3000)
+    windows = [text[i : i + 777] for i in range(0, len(text), 777)]
+    summarizer = SummaryGenerator(None, chunk_strategy=strategy)
+
+    assert list(summarizer.chunk_stream(windows)) == summarizer.chunk_text(text)
+
+
+def test_recursive_chunk_stream_keeps_overlap_across_buffers():
+    """Paragraphs split across stream buffers keep the overlap chunk_text gives."""
+    rng = random.Random(0)
+    text = "\n\n".join(
+        make_text(seed=i, sentences=rng.randint(1, 40)) for i in range(300)
+    )
+    windows = [text[i : i + 7000] for i in range(0, len(text), 7000)]
+    summarizer = SummaryGenerator(None, chunk_strategy="recursive")
+
+    assert list(summarizer.chunk_stream(windows)) == summarizer.chunk_text(text)
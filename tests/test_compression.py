@@ -0,0 +1,100 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.processors.compression import (
+    SentenceCompressor,
+    iter_sentence_batches,
+    split_sentences,
+)
+from src.services.summary import SummaryGenerator
+
+DOCUMENT = (
+    "This page intentionally left blank. "
+    "The merger closed in March for 4.2 billion dollars. "
+    "This page intentionally left blank. "
+    "Regulators approved the acquisition after a lengthy antitrust review. "
+    "This page intentionally left blank. "
+    "Integration costs reduced quarterly margins by three points."
+)
+
+
+def test_split_sentences():
+    assert split_sentences("One. Two!\nThree") == ["One.", "Two!", "Three"]
+    assert split_sentences("Paid 4.2 billion. Done.") == ["Paid 4.2 billion.", "Done."]
+    assert split_sentences("今日は晴れ。明日は雨。") == ["今日は晴れ。", "明日は雨。"]
+
+
+@pytest.mark.parametrize("method", ["tfidf", "textrank"])
+def test_compress_reaches_ratio(method):
+    compressor = SentenceCompressor(0.5, method).fit(DOCUMENT)
+    compressed = compressor.compress(DOCUMENT)
+
+    assert len(compressed) <= 0.5 * len(DOCUMENT)
+    assert compressed.count("This page intentionally left blank.") <= 1
+    kept = split_sentences(compressed)
+    assert kept == [s for s in split_sentences(DOCUMENT) if s in kept]  # in order
+
+
+def test_compress_chunks_drops_repeated_sentences():
+    compressor = SentenceCompressor(1.0).fit(DOCUMENT)
+    chunks = compressor.compress_chunks(
+        ["Boilerplate notice. Revenue grew.", "Boilerplate notice. Costs fell."]
+    )
+
+    assert chunks == ["Boilerplate notice. Revenue grew.", "Costs fell."]
+
+
+def test_compress_keeps_one_sentence():
+    compressor = SentenceCompressor(0.01).fit(DOCUMENT)
+
+    assert len(split_sentences(compressor.compress(DOCUMENT))) == 1
+
+
+def test_invalid_ratio():
+    with pytest.raises(ValueError):
+        SentenceCompressor(0)
+
+
+def test_summary_generator_compresses_prompts():
+    """Chunks are compressed before they are formatted into prompts."""
+    model = MagicMock()
+    model.generate_response.return_value = "summary"
+    summarizer = SummaryGenerator(model, compression_ratio=0.5)
+
+    response = summarizer.generate_summary(DOCUMENT, "brief")
+
+    assert response.success is True
+    prompt = model.generate_response.call_args[0][0]
+    assert "This page intentionally left blank." not in prompt
+    assert len(prompt) < len(summarizer.get_prompt("brief")) + len(DOCUMENT) / 2
+
+
+def test_fit_stream_matches_fit():
+    """Sentences split across windows are counted as in the whole text."""
+    windows = [DOCUMENT[i : i + 7] for i in range(0, len(DOCUMENT), 7)]
+    whole = SentenceCompressor(0.5).fit(DOCUMENT)
+    streamed = SentenceCompressor(0.5).fit_stream(windows)
+
+    assert [s for batch in iter_sentence_batches(windows) for s in batch] == (
+        split_sentences(DOCUMENT)
+    )
+    assert streamed.vocabulary == whole.vocabulary
+    assert streamed.idf.tolist() == pytest.approx(whole.idf.tolist())
+
+
+def test_summary_generator_compresses_streamed_input(caplog):
+    """Re-iterable streams are compressed; one-shot iterators are logged."""
+    model = MagicMock()
+    model.generate_response.return_value = "summary"
+    summarizer = SummaryGenerator(model, compression_ratio=0.5)
+    windows = [DOCUMENT[i : i + 50] for i in range(0, len(DOCUMENT), 50)]
+
+    summarizer.generate_summary(windows, "brief")
+    prompt = model.generate_response.call_args[0][0]
+    assert "This page intentionally left blank." not in prompt
+
+    summarizer.generate_summary(iter(windows), "brief")
+    prompt = model.generate_response.call_args[0][0]
+    assert "This page intentionally left blank." in prompt
+    assert "COMPRESSION_RATIO is ignored" in caplog.text
@@ -0,0 +1,156 @@
+import threading
+from unittest.mock import MagicMock, patch
+
+import anthropic
+import httpx
+import openai
+import pytest
+from requests.exceptions import Timeout
+from tenacity import RetryError, Future
+
+from src.services.concurrency import (
+    AdaptiveConcurrencyLimiter,
+    concurrency_metrics,
+    get_limiter,
+    is_overload_error,
+)
+from src.services.model_manager import (
+    AdaptiveConcurrencyModel,
+    ModelManager,
+    OpenAIModel,
+    config,
+)
+
+
+class RateLimited(Exception):
+    status_code = 429
+
+
+def retry_error(error: Exception) -> RetryError:
+    attempt = Future(attempt_number=3)
+    attempt.set_exception(error)
+    return RetryError(attempt)
+
+
+def test_overload_detection():
+    request = httpx.Request("POST", "https://example.com")
+    http_429 = httpx.HTTPStatusError(
+        "429", request=request, response=httpx.Response(429, request=request)
+    )
+
+    assert is_overload_error(RateLimited())
+    assert is_overload_error(Timeout())
+    assert is_overload_error(http_429)
+    assert is_overload_error(openai.APITimeoutError(request=request))
+    assert is_overload_error(anthropic.APITimeoutError(request=request))
+    assert is_overload_error(retry_error(RateLimited()))
+    assert not is_overload_error(ValueError("bad prompt"))
+    assert not is_overload_error(retry_error(ValueError("bad prompt")))
+
+
+def test_limit_grows_on_success_when_busy():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=4, max_limit=6)
+
+    for _ in range(5):
+        limiter.acquire()
+        limiter.release(latency=0.1, in_flight=4)
+
+    assert limiter.limit == 6
+    assert limiter.successes == 5
+
+
+def test_limit_holds_when_idle():
+    """Unused capacity is not evidence that more would be fine."""
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=8)
+
+    limiter.acquire()
+    limiter.release(latency=0.1, in_flight=1)
+
+    assert limiter.limit == 8
+
+
+def test_limit_backs_off_on_drops_and_slow_responses():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=10, backoff_ratio=0.5)
+
+    limiter.acquire()
+    limiter.release(dropped=True)
+    assert limiter.limit == 5
+
+    limiter.acquire()
+    limiter.release(latency=0.1, in_flight=5)
+    limiter.acquire()
+    limiter.release(latency=1.0, in_flight=5)  # 10x the minimum latency
+    assert limiter.limit == 3
+    assert limiter.drops == 1
+
+    for _ in range(5):
+        limiter.acquire()
+        limiter.release(dropped=True)
+    assert limiter.limit == limiter.min_limit
+
+
+def test_acquire_blocks_at_limit():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=1, max_limit=1)
+    limiter.acquire()
+
+    with pytest.raises(TimeoutError):
+        limiter.acquire(timeout=0.01)
+
+    threading.Timer(0.01, limiter.release).start()
+    assert limiter.acquire(timeout=1) == 1
+
+
+def test_adaptive_model_feeds_limiter():
+    model = MagicMock()
+    model.generate_response.side_effect = ["Summary", RateLimited(), ValueError()]
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=2, backoff_ratio=0.5)
+    adaptive = AdaptiveConcurrencyModel(model, limiter)
+
+    assert adaptive.generate_response("prompt") == "Summary"
+    assert limiter.limit == 3
+    with pytest.raises(RateLimited):
+        adaptive.generate_response("prompt")
+    assert limiter.limit == 1
+    with pytest.raises(ValueError):
+        adaptive.generate_response("prompt")
+    assert limiter.limit == 1
+    assert limiter.in_flight == 0
+
+
+def test_model_manager_gates_provider_calls_when_enabled(monkeypatch):
+    """The adaptive limit replaces the static rate limiter and skips retry waits."""
+    monkeypatch.setattr(config, "ADAPTIVE_CONCURRENCY", True)
+    with patch("src.services.model_manager.ChatOpenAI") as chat:
+        model = ModelManager.get_model("openai")
+
+    assert isinstance(model, OpenAIModel)
+    assert model.limiter is get_limiter("openai")
+    assert model.rate_limiter is None
+    assert chat.call_args.kwargs["rate_limiter"] is None
+    # SDK retries would hide 429s from the limiter and inflate the latency
+    assert chat.call_args.kwargs["max_retries"] == 0
+    assert "limit" in concurrency_metrics()["openai"]
+
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=4, backoff_ratio=0.5)
+    model.limiter = limiter
+    model.model = MagicMock()
+    model.model.predict.side_effect = [RateLimited(), "Summary"]
+    assert model.generate_response("prompt") == "Summary"
+    # one drop for the failed attempt, one on-time success for the retry
+    assert (limiter.drops, limiter.successes, limiter.in_flight) == (1, 1, 0)
+
+
+def test_short_requests_do_not_look_fast():
+    """Latency is compared per unit of size against a long-term average."""
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=4, max_limit=4)
+
+    for _ in range(20):
+        limiter.acquire()
+        limiter.release(latency=8.0, in_flight=2, size=4.0)
+    limiter.acquire()
+    limiter.release(latency=0.5, in_flight=2, size=0.2)  # a short last chunk
+    limiter.acquire()
+    limiter.release(latency=8.0, in_flight=2, size=4.0)
+
+    assert limiter.limit == 4
+    assert limiter.metrics()["baseline_latency"] == pytest.approx(2.0, rel=0.05)
@@ -1,11 +1,18 @@
 import os
+import zipfile
 from typing import Generator
 from unittest.mock import MagicMock, patch
 
 import pytest
 
 from src.models.schemas import APIResponse  # Import APIResponse model
-from src.processors.document import DocumentProcessor
+from src.processors.document import (
+    DocumentProcessor,
+    config,
+    iter_docx_paragraphs,
+    page_ranges,
+)
+from tests.pdf_helpers import write_sample_pdf
 
 # Test Files Directory
 TEST_FILES_DIR = "tests/test_files/"
@@ -30,11 +37,27 @@ def _pdf_file() -> Generator[str, None, None]:
         os.remove(file_path)
 
 
+# Helper function to create DOCX files
+def create_docx_file(file_path: str, body: str, media: bytes = b"") -> None:
+    """Create a minimal DOCX archive whose body XML is ``body``."""
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    namespace = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+    with zipfile.ZipFile(file_path, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr(
+            "word/document.xml",
+            f'<w:document xmlns:w="{namespace}"><w:body>{body}</w:body></w:document>',
+        )
+        if media:
+            archive.writestr("word/media/image1.png", media)
+
+
 @pytest.fixture
 def _docx_file() -> Generator[str, None, None]:
     """Fixture that provides a sample DOCX file for testing."""
     file_path = os.path.join(TEST_FILES_DIR, "sample.docx")
-    create_test_file(file_path, "This is a test DOCX file.")
+    create_docx_file(
+        file_path, "<w:p><w:r><w:t>This is a test DOCX file.</w:t></w:r></w:p>"
+    )
     yield file_path
 
     if os.path.exists(file_path):
@@ -139,12 +162,8 @@ def test_successful_pdf_processing(_pdf_file: str) -> None:
 
 
 # Test Successful DOCX Processing
-@patch("src.processors.document.Docx2txtLoader")
-def test_successful_docx_processing(mock_loader: MagicMock, _docx_file: str) -> None:
+def test_successful_docx_processing(_docx_file: str) -> None:
     """Test that a valid DOCX file is processed correctly."""
-    mock_loader.return_value.load.return_value = [
-        MagicMock(page_content="Extracted DOCX content")
-    ]
     processor = DocumentProcessor(_docx_file)
     response = processor.extract_text()
 
@@ -153,7 +172,7 @@ def test_successful_docx_processing(mock_loader: MagicMock, _docx_file: str) ->
     assert response.data is not None
     assert response.data.file_path == _docx_file
     assert response.data.file_type == "docx"
-    assert response.data.content == "Extracted DOCX content"
+    assert response.data.content == "This is a test DOCX file."
 
 
 # Test Successful TXT Processing
@@ -231,3 +250,165 @@ def test_handling_unsupported_formats(_unsupported_file: str) -> None:
         == "Value error, Unsupported file format. Only PDF, TXT, and DOCX are allowed."
     )
     assert response.data is None
+
+
+# Test Streaming TXT Extraction
+def test_txt_iter_text_windows(_txt_file: str) -> None:
+    """Streamed windows reassemble the same text as extract_text."""
+    processor = DocumentProcessor(_txt_file)
+    windows = list(processor.iter_text(window_size=4))
+
+    assert len(windows) > 1
+    assert "".join(windows) == processor.extract_text().data.content
+
+
+def test_txt_iter_text_multibyte_split(tmp_path) -> None:
+    """Characters split across windows are decoded correctly."""
+    file_path = tmp_path / "unicode.txt"
+    file_path.write_text("Bonjour, это тест, こんにちは", encoding="utf-8")
+    processor = DocumentProcessor(str(file_path))
+
+    assert "".join(processor.iter_text(window_size=3)) == file_path.read_text(
+        encoding="utf-8"
+    )
+
+
+def test_txt_bom_detection(tmp_path) -> None:
+    """UTF-16 files are recognised by their byte order mark."""
+    file_path = tmp_path / "utf16.txt"
+    file_path.write_text("UTF-16 text", encoding="utf-16")
+    processor = DocumentProcessor(str(file_path))
+
+    assert processor.extract_text().data.content == "UTF-16 text"
+    assert "".join(processor.iter_text(window_size=5)) == "UTF-16 text"
+
+
+def test_txt_fallback_encoding(tmp_path) -> None:
+    """Non UTF-8 bytes fall back to cp1252 instead of failing."""
+    file_path = tmp_path / "legacy.txt"
+    file_path.write_bytes("plain ascii then café".encode("cp1252"))
+    processor = DocumentProcessor(str(file_path))
+
+    assert processor.extract_text().data.content == "plain ascii then café"
+    assert "".join(processor.iter_text(window_size=8)) == "plain ascii then café"
+
+
+def test_txt_stray_byte_decodes_the_same_everywhere(tmp_path, monkeypatch) -> None:
+    """Inline, streamed and spooled extraction agree on a late invalid byte."""
+    monkeypatch.setattr(config, "SPOOL_DIR", str(tmp_path))
+    file_path = tmp_path / "mostly_utf8.txt"
+    # spans two default windows; only the last is decoded with the fallback
+    file_path.write_bytes("naïve café ".encode("utf-8") * 100_000 + b"\xa3")
+    processor = DocumentProcessor(str(file_path))
+
+    streamed = "".join(processor.iter_text())
+    assert streamed.startswith("naïve café ")
+    assert streamed.endswith("£")
+    assert processor.extract_text().data.content == streamed
+    assert processor.extract_text(inline=False).data.read_content() == streamed
+
+
+def test_iter_text_rejects_other_formats(_unsupported_file: str) -> None:
+    with pytest.raises(ValueError):
+        list(DocumentProcessor(_unsupported_file).iter_text())
+
+
+# Test Parallel PDF Extraction
+def test_parallel_pdf_matches_loader(tmp_path, monkeypatch) -> None:
+    """Page-range sharding returns the same text, in page order, as PyPDFLoader."""
+    file_path = str(tmp_path / "pages.pdf")
+    write_sample_pdf(file_path, pages=9, lines=3)
+    monkeypatch.setattr(config, "PDF_PARALLEL_MIN_PAGES", 2)
+
+    sequential = DocumentProcessor(file_path, pdf_workers=1).extract_text()
+    parallel = DocumentProcessor(file_path, pdf_workers=3)
+    with patch("src.processors.document.os.cpu_count", return_value=3):
+        response = parallel.extract_text()
+
+    assert response.success is True
+    assert response.data.content == sequential.data.content
+    assert response.data.content.index("Page 2 ") < response.data.content.index(
+        "Page 8 "
+    )
+
+
+def test_page_ranges() -> None:
+    assert page_ranges(10, 4) == [(0, 3), (3, 6), (6, 9), (9, 10)]
+    assert page_ranges(2, 8) == [(0, 1), (1, 2)]
+    assert page_ranges(0, 4) == []
+
+
+# Test Streaming DOCX Extraction
+def test_docx_paragraphs_tables_and_breaks(tmp_path) -> None:
+    """Paragraphs, table cells, tabs and breaks are streamed in order."""
+    file_path = str(tmp_path / "report.docx")
+    create_docx_file(
+        file_path,
+        "<w:p><w:r><w:t>Title</w:t></w:r></w:p>"
+        "<w:tbl><w:tr><w:tc><w:p><w:r><w:t>Cell</w:t></w:r></w:p></w:tc></w:tr></w:tbl>"
+        "<w:p><w:r><w:t>Name</w:t><w:tab/><w:t>Value</w:t><w:br/>"
+        "<w:t xml:space='preserve'>next </w:t></w:r><w:r><w:t>line</w:t></w:r></w:p>",
+        media=os.urandom(1024),
+    )
+
+    assert list(iter_docx_paragraphs(file_path)) == [
+        "Title",
+        "Cell",
+        "Name\tValue\nnext line",
+    ]
+    processor = DocumentProcessor(file_path)
+    content = processor.extract_text().data.content
+    assert content == "Title\nCell\nName\tValue\nnext line"
+    assert "".join(processor.iter_text()) == content
+
+
+def test_docx_without_text(tmp_path) -> None:
+    file_path = str(tmp_path / "images.docx")
+    create_docx_file(file_path, "<w:p/><w:p/>", media=os.urandom(1024))
+
+    response = DocumentProcessor(file_path).extract_text()
+
+    assert response.success is False
+    assert response.message == "No text found in document"
+
+
+# Test Spooled Extraction
+def test_extract_text_spooled(_txt_file: str, tmp_path, monkeypatch) -> None:
+    """inline=False writes the text to SPOOL_DIR instead of the response."""
+    monkeypatch.setattr(config, "SPOOL_DIR", str(tmp_path))
+    response = DocumentProcessor(_txt_file).extract_text(inline=False)
+
+    assert response.success is True
+    assert response.data.content is None
+    assert os.path.dirname(response.data.content_path) == str(tmp_path)
+    assert response.data.read_content() == "This is a test TXT file."
+
+
+def test_extract_text_spooled_parallel_pdf(tmp_path, monkeypatch) -> None:
+    """Spooled extraction also shards large PDFs, writing pages in order."""
+    file_path = str(tmp_path / "pages.pdf")
+    write_sample_pdf(file_path, pages=9, lines=3)
+    monkeypatch.setattr(config, "PDF_PARALLEL_MIN_PAGES", 2)
+    monkeypatch.setattr(config, "SPOOL_DIR", str(tmp_path))
+
+    sequential = DocumentProcessor(file_path, pdf_workers=1).extract_text()
+    parallel = DocumentProcessor(file_path, pdf_workers=3)
+    with (
+        patch("src.processors.document.os.cpu_count", return_value=3),
+        patch(
+            "src.processors.document.PyPDFLoader",
+            side_effect=AssertionError("serial loader used"),
+        ),
+    ):
+        response = parallel.extract_text(inline=False)
+
+    assert response.success is True
+    assert response.data.read_content() == sequential.data.content
+
+
+def test_extract_text_spooled_empty(_empty_file: str, tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(config, "SPOOL_DIR", str(tmp_path))
+    response = DocumentProcessor(_empty_file).extract_text(inline=False)
+
+    assert response.message == "No text found in document"
+    assert not os.listdir(tmp_path)
@@ -0,0 +1,138 @@
+from unittest.mock import MagicMock
+
+import pytest
+from requests.exceptions import Timeout
+
+from src.services.jobs import JobRunner, JobStore
+from src.services.summary import SummaryGenerator
+
+
+@pytest.fixture
+def db_path(tmp_path) -> str:
+    return str(tmp_path / "jobs.db")
+
+
+def make_runner(db_path: str, model: MagicMock) -> JobRunner:
+    summarizer = SummaryGenerator(model)
+    summarizer.chunk_text = MagicMock(side_effect=lambda text: text.split("|"))
+    return JobRunner(JobStore(db_path), summarizer)
+
+
+def test_job_success(db_path):
+    model = MagicMock()
+    model.generate_response.side_effect = ["Summary 1", "Summary 2"]
+    runner = make_runner(db_path, model)
+
+    job_id = runner.submit("Chunk1.|Chunk2.")
+    assert runner.store.status(job_id).code == 202
+
+    runner.run_until_empty()
+    response = runner.store.status(job_id)
+
+    assert response.success is True
+    assert response.code == 200
+    assert response.data.status == "success"
+    assert response.data.summary == "Summary 1\nSummary 2"
+
+
+def test_job_chunks_are_compressed(db_path):
+    model = MagicMock()
+    model.generate_response.return_value = "Summary"
+    runner = make_runner(db_path, model)
+    runner.summarizer.compression_ratio = 0.5
+
+    runner.submit("Page left blank. Revenue grew.|Page left blank. Costs fell.")
+    runner.run_until_empty()
+
+    prompts = [call.args[0] for call in model.generate_response.call_args_list]
+    assert "Revenue grew." in prompts[0]
+    assert "Page left blank." not in prompts[1]
+
+
+def test_job_partial_failure(db_path):
+    model = MagicMock()
+    model.generate_response.side_effect = ["Summary 1", Timeout("Timeout error")]
+    runner = make_runner(db_path, model)
+
+    job_id = runner.submit("Chunk1.|Chunk2.")
+    runner.run_until_empty()
+    response = runner.store.status(job_id)
+
+    assert response.code == 206
+    assert response.data.status == "partial"
+    assert "Timeout error" in response.message
+
+
+def test_job_failure_without_message(db_path):
+    """An exception with an empty message still marks its chunk as failed."""
+    model = MagicMock()
+    model.generate_response.side_effect = [TimeoutError(), "Summary 2"]
+    runner = make_runner(db_path, model)
+
+    job_id = runner.submit("Chunk1.|Chunk2.")
+    runner.run_until_empty()
+    response = runner.store.status(job_id)
+
+    assert response.code == 206
+    assert response.data.summary == "Summary 2"
+    assert response.message == "TimeoutError"
+
+
+def test_job_resumes_after_restart(db_path):
+    """Completed chunks are not sent to the model again after a crash."""
+    model = MagicMock()
+    model.generate_response.side_effect = ["Summary 1", KeyboardInterrupt()]
+    runner = make_runner(db_path, model)
+    job_id = runner.submit("Chunk1.|Chunk2.|Chunk3.")
+
+    with pytest.raises(KeyboardInterrupt):
+        runner.run_next()
+    runner.store.close()
+
+    model = MagicMock()
+    model.generate_response.side_effect = ["Summary 2", "Summary 3"]
+    restarted = make_runner(db_path, model)
+    assert restarted.recover() == 1
+    restarted.run_until_empty()
+
+    response = restarted.store.status(job_id)
+    assert response.data.status == "success"
+    assert response.data.summary == "Summary 1\nSummary 2\nSummary 3"
+    assert model.generate_response.call_count == 2
+
+
+def test_job_priority(db_path):
+    model = MagicMock()
+    model.generate_response.return_value = "summary"
+    runner = make_runner(db_path, model)
+
+    low = runner.submit("low", priority=0)
+    high = runner.submit("high", priority=5)
+
+    assert runner.run_next() == high
+    assert runner.run_next() == low
+    assert runner.run_next() is None
+
+
+def test_job_cancellation(db_path):
+    model = MagicMock()
+    model.generate_response.return_value = "summary"
+    runner = make_runner(db_path, model)
+
+    job_id = runner.submit("Chunk1.|Chunk2.")
+    assert runner.store.cancel(job_id) is True
+    runner.run_until_empty()
+    response = runner.store.status(job_id)
+
+    assert response.success is False
+    assert response.message == "Job cancelled"
+    assert response.data.status == "error"
+    model.generate_response.assert_not_called()
+    assert runner.store.cancel(job_id) is False
+
+
+def test_unknown_job(db_path):
+    response = JobStore(db_path).status("missing")
+
+    assert response.code == 404
+    assert response.data is None
@@ -19,6 +19,7 @@ def test_successful_openai_model_initialization():
         model = ModelManager.get_model("openai")
         assert isinstance(model, OpenAIModel)
         mock_openai.assert_called_once()
+        assert "max_retries" not in mock_openai.call_args.kwargs
 
 
 def test_successful_anthropic_model_initialization():
@@ -0,0 +1,236 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+from langchain_core.messages import AIMessage
+
+from src.services.concurrency import AdaptiveConcurrencyLimiter
+from src.services.model_manager import (
+    AdaptiveConcurrencyModel,
+    AnthropicModel,
+    Model,
+    OpenAIModel,
+    RoutingModel,
+)
+from src.services.prompts import (
+    PromptCacheStats,
+    build_prompt,
+    document_outline,
+    instruction_from_template,
+)
+from src.services.summary import SummaryGenerator
+
+
+class FakeCachingChat:
+    """Local stand-in for a chat provider with prefix caching.
+
+    A system prompt of at least ``min_tokens`` is cached when it is marked with
+    ``cache_control`` (or always, with ``automatic``), like the real providers;
+    usage is reported like langchain does, at roughly four characters per token.
+    """
+
+    def __init__(self, automatic: bool = False, min_tokens: int = 1024):
+        self.automatic = automatic
+        self.min_tokens = min_tokens
+        self.cache = set()
+        self.calls = []
+
+    def invoke(self, messages):
+        system, human = messages
+        self.calls.append(messages)
+        if isinstance(system.content, list):
+            block = system.content[0]
+            prefix, cacheable = block["text"], "cache_control" in block
+        else:
+            prefix, cacheable = system.content, self.automatic
+        prefix_tokens = len(prefix) // 4
+        cacheable = cacheable and prefix_tokens >= self.min_tokens
+        details = {"cache_read": 0, "cache_creation": 0}
+        if cacheable and prefix in self.cache:
+            details["cache_read"] = prefix_tokens
+        elif cacheable:
+            self.cache.add(prefix)
+            details["cache_creation"] = prefix_tokens
+        input_tokens = prefix_tokens + len(human.content) // 4
+        return AIMessage(
+            content=f"summary of {human.content[:10]}",
+            usage_metadata={
+                "input_tokens": input_tokens,
+                "output_tokens": 5,
+                "total_tokens": input_tokens + 5,
+                "input_token_details": details,
+            },
+        )
+
+
+@pytest.fixture
+def anthropic_model() -> AnthropicModel:
+    with patch("src.services.model_manager.ChatAnthropic"):
+        model = AnthropicModel()
+    model.model = FakeCachingChat()
+    return model
+
+
+CHUNKS = [f"Section {i}. " + "Some body text for the section. " * 20 for i in range(5)]
+# about 1,400 tokens: enough for the prefix to be cached
+GLOSSARY = "\n".join(
+    f"Term {i}: what term {i} means in this report." for i in range(120)
+)
+
+
+def test_build_prompt_prefix_is_chunk_independent():
+    first = build_prompt("Summarize this.", "chunk one", "1. Intro")
+    second = build_prompt("Summarize this.", "chunk two", "1. Intro")
+    assert first.prefix == second.prefix
+    assert first.prefix.startswith("Summarize this.")
+    assert "1. Intro" in first.prefix
+    assert (first.suffix, second.suffix) == ("chunk one", "chunk two")
+
+
+def test_instruction_from_template():
+    generator = SummaryGenerator(MagicMock())
+    assert instruction_from_template(generator.get_prompt("brief")) == (
+        "Provide a short and concise summary of the following text:"
+    )
+
+
+def test_document_outline_collects_headings():
+    text = (
+        "# Annual report\n"
+        "Revenue grew in every region this year.\n"
+        "1. Introduction\n"
+        "Plain sentence that ends with a period.\n"
+        "2.1 Market Overview\n"
+        "RISK FACTORS\n"
+    )
+    outline = document_outline(text, max_chars=1000)
+    assert outline.splitlines() == [
+        "# Annual report",
+        "1. Introduction",
+        "2.1 Market Overview",
+        "RISK FACTORS",
+    ]
+    assert document_outline(text, max_chars=20) == "# Annual report"
+    assert document_outline("no headings here.", max_chars=100) is None
+
+
+def test_anthropic_marks_prefix_and_counts_cache_hits(anthropic_model):
+    generator = SummaryGenerator(anthropic_model, prompt_caching=True)
+    for chunk in CHUNKS:
+        generator.summarize_chunk(chunk, "brief", context=GLOSSARY)
+
+    system = anthropic_model.model.calls[0][0]
+    assert system.content[0]["cache_control"] == {"type": "ephemeral"}
+    prefix_tokens = len(system.content[0]["text"]) // 4
+    metrics = anthropic_model.prompt_cache.metrics()
+    assert metrics["requests"] == len(CHUNKS)
+    assert metrics["hits"] == len(CHUNKS) - 1
+    assert metrics["cache_creation_tokens"] == prefix_tokens
+    assert metrics["cache_read_tokens"] == prefix_tokens * (len(CHUNKS) - 1)
+    assert 0 < metrics["hit_ratio"] < 1
+
+
+def test_short_prefix_is_not_marked(anthropic_model):
+    """Prefixes under the provider minimum are never cached, so are not marked."""
+    generator = SummaryGenerator(anthropic_model, prompt_caching=True)
+    for chunk in CHUNKS:
+        generator.summarize_chunk(chunk, "brief", context="1. Intro\n2. Body")
+
+    system = anthropic_model.model.calls[0][0]
+    assert "cache_control" not in system.content[0]
+    assert anthropic_model.prompt_cache.hits == 0
+
+
+def test_haiku_needs_a_longer_prefix():
+    with patch("src.services.model_manager.ChatAnthropic"):
+        model = AnthropicModel("claude-3-5-haiku-latest")
+    model.model = FakeCachingChat(min_tokens=model.prompt_cache_min_tokens)
+    model.generate_with_prefix(GLOSSARY, "chunk")
+    assert "cache_control" not in model.model.calls[0][0].content[0]
+    model.generate_with_prefix(GLOSSARY * 2, "chunk")
+    assert "cache_control" in model.model.calls[1][0].content[0]
+
+
+def test_openai_sends_prefix_as_system_message():
+    with patch("src.services.model_manager.ChatOpenAI"):
+        model = OpenAIModel()
+    model.model = FakeCachingChat(automatic=True)
+    assert model.generate_with_prefix(GLOSSARY, "chunk a") == "summary of chunk a"
+    model.generate_with_prefix(GLOSSARY, "chunk b")
+    model.generate_with_prefix("short prefix", "chunk c")
+    system, human = model.model.calls[1]
+    assert (system.content, human.content) == (GLOSSARY, "chunk b")
+    assert model.prompt_cache.metrics()["hits"] == 1
+
+
+def test_generate_summary_uses_outline_as_prefix(anthropic_model, monkeypatch):
+    from src.services import summary
+
+    monkeypatch.setattr(summary.config, "PROMPT_OUTLINE_MAX_CHARS", 8000)
+    generator = SummaryGenerator(anthropic_model, prompt_caching=True)
+    text = "".join(
+        f"{i}. Section Number {i} Of The Report\n{'Words in the section. ' * 20}\n"
+        for i in range(1, 200)
+    )
+    response = generator.generate_summary(text, "brief")
+
+    assert response.success
+    calls = anthropic_model.model.calls
+    assert len(calls) > 1
+    prefixes = {call[0].content[0]["text"] for call in calls}
+    assert len(prefixes) == 1
+    assert "1. Section Number 1 Of The Report" in prefixes.pop()
+    assert anthropic_model.prompt_cache.hits == len(calls) - 1
+
+
+def test_prompt_caching_disabled_keeps_single_prompt():
+    model = MagicMock()
+    model.generate_response.return_value = "summary"
+    generator = SummaryGenerator(model, prompt_caching=False)
+    generator.summarize_chunk("chunk", "brief")
+    model.generate_response.assert_called_once()
+    model.generate_with_prefix.assert_not_called()
+
+
+def test_default_generate_with_prefix_concatenates():
+    class EchoModel(Model):
+        def generate_response(self, prompt: str) -> str:
+            return prompt
+
+    prompt = EchoModel().generate_with_prefix("Summarize.", "chunk")
+    assert prompt == "Summarize.\n\nchunk"
+    assert EchoModel().prompt_cache is None
+
+
+def test_wrappers_forward_prefix():
+    limiter = AdaptiveConcurrencyLimiter()
+    inner = MagicMock()
+    inner.generate_with_prefix.return_value = "ok"
+    model = AdaptiveConcurrencyModel(inner, limiter)
+    assert model.generate_with_prefix("prefix ", "chunk") == "ok"
+    inner.generate_with_prefix.assert_called_once_with("prefix ", "chunk")
+    assert limiter.successes == 1
+
+    router = RoutingModel({"only": inner}, rules=[], default="only")
+    router.generate_with_prefix("prefix ", "chunk")
+    assert router.stats()["targets"]["only"]["prompt_chars"] == len("prefix chunk")
+
+
+def test_cache_stats_ignore_missing_usage():
+    stats = PromptCacheStats()
+    stats.record(AIMessage(content="no usage"))
+    assert stats.metrics() == {
+        "requests": 1,
+        "hits": 0,
+        "input_tokens": 0,
+        "cache_read_tokens": 0,
+        "cache_creation_tokens": 0,
+        "hit_ratio": 0.0,
+    }
+
+
+def test_prompt_caching_defaults_to_config(monkeypatch):
+    from src.services import summary
+
+    monkeypatch.setattr(summary.config, "PROMPT_CACHING", True)
+    assert SummaryGenerator(MagicMock()).prompt_caching is True
+    assert SummaryGenerator(MagicMock(), prompt_caching=False).prompt_caching is False
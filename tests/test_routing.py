@@ -0,0 +1,92 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.models.schemas import RoutingRule
+from src.services.model_manager import (
+    AnthropicModel,
+    ModelManager,
+    OpenAIModel,
+    RoutingModel,
+)
+from src.services.summary import SummaryGenerator
+
+
+@pytest.fixture
+def models():
+    fast, strong = MagicMock(), MagicMock()
+    fast.generate_response.return_value = "fast summary"
+    strong.generate_response.return_value = "strong summary"
+    return {"fast": fast, "strong": strong}
+
+
+@pytest.fixture
+def router(models) -> RoutingModel:
+    return RoutingModel(
+        models,
+        rules=[
+            RoutingRule(target="fast", max_chars=50),
+            RoutingRule(target="fast", languages=["en"], summary_types=["brief"]),
+        ],
+        default="strong",
+        costs={"fast": 0.1, "strong": 10.0},
+    )
+
+
+ENGLISH = (
+    "The company reported higher revenue this quarter, driven by strong demand "
+    "for its cloud services and improved margins across all regions."
+)
+FRENCH = (
+    "La société a annoncé une hausse de son chiffre d'affaires ce trimestre, "
+    "portée par une forte demande pour ses services et de meilleures marges."
+)
+
+
+def test_route_by_length_language_and_summary_type(router):
+    assert router.route("Table of contents", "technical") == "fast"
+    assert router.route(ENGLISH, "brief") == "fast"
+    assert router.route(ENGLISH, "technical") == "strong"
+    assert router.route(FRENCH, "brief") == "strong"
+
+
+def test_summary_generator_routes_each_chunk(router, models):
+    summarizer = SummaryGenerator(router)
+    summarizer.chunk_text = MagicMock(return_value=["Short chunk.", FRENCH])
+
+    response = summarizer.generate_summary("ignored", "brief")
+
+    assert response.data.summary == "fast summary\nstrong summary"
+    stats = router.stats()
+    assert stats["decisions"] == {"rule 0 -> fast": 1, "default -> strong": 1}
+    assert stats["targets"]["fast"]["calls"] == 1
+    assert stats["targets"]["strong"]["estimated_cost"] > (
+        stats["targets"]["fast"]["estimated_cost"]
+    )
+
+
+def test_routing_errors_are_counted(router, models):
+    models["strong"].generate_response.side_effect = RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        router.generate_routed("prompt", FRENCH, "brief")
+
+    assert router.stats()["targets"]["strong"]["errors"] == 1
+
+
+def test_unknown_target(models):
+    with pytest.raises(ValueError, match="Unknown routing targets"):
+        RoutingModel(models, [RoutingRule(target="missing")], default="strong")
+
+
+def test_model_manager_routing_from_config():
+    with (
+        patch("src.services.model_manager.ChatOpenAI") as mock_openai,
+        patch("src.services.model_manager.ChatAnthropic"),
+    ):
+        model = ModelManager.get_model("routing")
+
+    assert isinstance(model, RoutingModel)
+    assert isinstance(model.models["fast"], OpenAIModel)
+    assert isinstance(model.models["strong"], AnthropicModel)
+    assert mock_openai.call_args.kwargs["model"] == "gpt-4o-mini"
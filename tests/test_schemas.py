@@ -0,0 +1,80 @@
+import json
+
+import pytest
+
+from src.models.schemas import (
+    APIResponse,
+    ContentStream,
+    DocumentResponse,
+    SummaryResponse,
+)
+
+
+def document_response(**content) -> APIResponse:
+    return APIResponse(
+        success=True,
+        code=200,
+        message="Text extracted successfully",
+        data=DocumentResponse(file_path="doc.txt", file_type="txt", **content),
+    )
+
+
+def test_iter_json_matches_model_dump():
+    response = document_response(content='Line "one"\nLine two, café')
+    streamed = json.loads("".join(response.iter_json(chunk_size=3)))
+
+    expected = json.loads(response.model_dump_json())
+    del expected["data"]["content_path"]
+    assert streamed == expected
+
+
+def test_iter_json_streams_spooled_content(tmp_path):
+    content_path = tmp_path / "content.txt"
+    content_path.write_text("Spooled text", encoding="utf-8")
+    response = document_response(content_path=str(content_path))
+
+    body = json.loads("".join(response.iter_json()))
+
+    assert body["data"]["content"] == "Spooled text"
+    assert "content_path" not in body["data"]
+    assert response.data.read_content() == "Spooled text"
+
+
+def test_iter_json_pages():
+    response = document_response(pages=iter(["Page 1", "\nPage 2"]))
+
+    body = json.loads("".join(response.iter_json()))
+
+    assert body["data"]["content"] == "Page 1\nPage 2"
+    assert "pages" not in response.model_dump()["data"]
+
+
+def test_iter_json_without_document():
+    summary = APIResponse(
+        success=True,
+        code=200,
+        message="Summarization successfully.",
+        data=SummaryResponse(status="success", summary="Summary"),
+    )
+    empty = document_response()
+
+    assert "".join(summary.iter_json()) == summary.model_dump_json()
+    assert json.loads("".join(empty.iter_json()))["data"]["content"] is None
+
+
+def test_content_stream_can_be_read_twice(tmp_path):
+    content_path = tmp_path / "content.txt"
+    content_path.write_text("Spooled text", encoding="utf-8")
+    stream = ContentStream(
+        DocumentResponse(
+            file_path="doc.txt", file_type="txt", content_path=str(content_path)
+        ),
+        chunk_size=4,
+    )
+
+    assert list(stream) == ["Spoo", "led ", "text"]
+    assert "".join(stream) == "Spooled text"
+    with pytest.raises(ValueError):
+        ContentStream(
+            DocumentResponse(file_path="doc.pdf", file_type="pdf", pages=iter([]))
+        )
@@ -0,0 +1,232 @@
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock
+
+import pytest
+from aiohttp import FormData
+from aiohttp.test_utils import TestClient, TestServer
+
+from src.api import server
+from src.api.server import SERVICE_KEY, AdmissionLimiter, Overloaded, create_app
+from src.processors.document import config as document_config
+
+
+@pytest.fixture
+def mock_model():
+    model = MagicMock()
+    model.generate_response.return_value = "summarization results"
+    return model
+
+
+def run_with_client(app, scenario):
+    async def runner():
+        async with TestClient(TestServer(app)) as client:
+            return await scenario(client)
+
+    return asyncio.run(runner())
+
+
+def make_app(model, tmp_path):
+    executor = ThreadPoolExecutor(max_workers=2)
+    return create_app(
+        model=model,
+        upload_dir=str(tmp_path),
+        parse_executor=executor,
+        model_executor=executor,
+    )
+
+
+def test_upload_extract_summarize(mock_model, tmp_path):
+    """A TXT upload can be extracted and summarized by its file_id."""
+
+    async def scenario(client):
+        form = FormData()
+        form.add_field("file", b"This is a test TXT file.", filename="sample.txt")
+        upload = await (await client.post("/upload", data=form)).json()
+        file_id = upload["data"]["file_id"]
+
+        extract = await client.post("/extract", json={"file_id": file_id})
+        summary = await client.post("/summarize", json={"file_id": file_id})
+        return upload, extract.status, await extract.json(), await summary.json()
+
+    upload, status, extract, summary = run_with_client(
+        make_app(mock_model, tmp_path), scenario
+    )
+
+    assert upload["success"] is True
+    assert status == 200
+    assert extract["data"]["content"] == "This is a test TXT file."
+    assert extract["data"]["file_type"] == "txt"
+    assert summary["data"] == {"status": "success", "summary": "summarization results"}
+
+
+def test_summarize_text(mock_model, tmp_path):
+    async def scenario(client):
+        response = await client.post(
+            "/summarize", json={"text": "Some text.", "summary_type": "brief"}
+        )
+        return await response.json()
+
+    body = run_with_client(make_app(mock_model, tmp_path), scenario)
+
+    assert body["success"] is True
+    mock_model.generate_response.assert_called_once()
+
+
+def test_unsupported_upload(mock_model, tmp_path):
+    async def scenario(client):
+        form = FormData()
+        form.add_field("file", b"data", filename="unsupported.xyz")
+        response = await client.post("/upload", data=form)
+        return response.status, await response.json()
+
+    status, body = run_with_client(make_app(mock_model, tmp_path), scenario)
+
+    assert status == 400
+    assert body["success"] is False
+
+
+def test_extract_unknown_file(mock_model, tmp_path):
+    """file_id cannot point outside the upload directory."""
+
+    async def scenario(client):
+        response = await client.post("/extract", json={"file_id": "../README.md"})
+        return response.status, await response.json()
+
+    status, body = run_with_client(make_app(mock_model, tmp_path), scenario)
+
+    assert status == 400
+    assert body["message"] == "File not found"
+
+
+def test_malformed_requests(mock_model, tmp_path):
+    """Bad input gets a 400 JSON error instead of a plain-text 500."""
+
+    async def scenario(client):
+        requests = [
+            client.post("/extract", json={"file_id": 5}),
+            client.post("/summarize", json={"file_id": None}),
+            client.post("/summarize", json={"text": 5}),
+            client.post("/summarize", json={"text": "x", "summary_type": "bogus"}),
+            client.post("/summarize", json={"text": "x", "summary_type": ["brief"]}),
+            client.post("/upload", json={"file": "x"}),
+        ]
+        results = []
+        for request in requests:
+            response = await request
+            results.append((response.status, await response.json()))
+        return results
+
+    results = run_with_client(make_app(mock_model, tmp_path), scenario)
+
+    assert [status for status, _ in results] == [400] * 6
+    assert all(body["success"] is False for _, body in results)
+    assert "summary_type" in results[3][1]["message"]
+    mock_model.generate_response.assert_not_called()
+
+
+def test_admission_limiter_sheds_load():
+    """Requests beyond concurrency plus queue size are rejected."""
+
+    async def scenario():
+        limiter = AdmissionLimiter(max_concurrency=1, max_queue=1)
+        release = asyncio.Event()
+
+        async def hold():
+            async with limiter.slot():
+                await release.wait()
+
+        tasks = [asyncio.create_task(hold()) for _ in range(2)]
+        await asyncio.sleep(0)
+        with pytest.raises(Overloaded):
+            async with limiter.slot():
+                pass
+        release.set()
+        await asyncio.gather(*tasks)
+        return limiter.pending
+
+    assert asyncio.run(scenario()) == 0
+
+
+def test_metrics(mock_model, tmp_path):
+    async def scenario(client):
+        response = await client.get("/metrics")
+        return response.status, await response.json()
+
+    status, body = run_with_client(make_app(mock_model, tmp_path), scenario)
+
+    assert status == 200
+    assert body["queues"] == {"parse": 0, "summary": 0}
+    assert "concurrency" in body
+
+
+def test_extract_removes_spooled_text(mock_model, tmp_path, monkeypatch):
+    """Extraction streams the spooled text and deletes it afterwards."""
+    spool_dir = tmp_path / "spool"
+    spool_dir.mkdir()
+    monkeypatch.setattr(document_config, "SPOOL_DIR", str(spool_dir))
+
+    async def scenario(client):
+        form = FormData()
+        form.add_field("file", b"Spooled content.", filename="sample.txt")
+        upload = await (await client.post("/upload", data=form)).json()
+        file_id = upload["data"]["file_id"]
+        extract = await client.post("/extract", json={"file_id": file_id})
+        summary = await client.post("/summarize", json={"file_id": file_id})
+        return await extract.json(), await summary.json()
+
+    extract, summary = run_with_client(
+        make_app(mock_model, tmp_path / "uploads"), scenario
+    )
+
+    assert extract["data"]["content"] == "Spooled content."
+    assert summary["data"]["status"] == "success"
+    assert not list(spool_dir.iterdir())
+
+
+def test_cancelled_extraction_removes_spooled_text(mock_model, tmp_path, monkeypatch):
+    """A worker that finishes after its request was cancelled leaves no spool file."""
+    spool_dir = tmp_path / "spool"
+    spool_dir.mkdir()
+    monkeypatch.setattr(document_config, "SPOOL_DIR", str(spool_dir))
+    (tmp_path / "doc.txt").write_text("Some text.")
+    release = threading.Event()
+    extract = server._extract
+
+    def slow_extract(file_path):
+        release.wait(5)
+        return extract(file_path)
+
+    monkeypatch.setattr(server, "_extract", slow_extract)
+    executor = ThreadPoolExecutor(max_workers=1)
+    service = make_app(mock_model, tmp_path)[SERVICE_KEY]
+    service.parse_executor = executor
+
+    async def scenario():
+        task = asyncio.create_task(service._extract("doc.txt"))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(scenario())
+    release.set()
+    executor.shutdown(wait=True)
+
+    assert not list(spool_dir.iterdir())
+
+
+def test_sweep_uploads(mock_model, tmp_path):
+    service = make_app(mock_model, tmp_path)[SERVICE_KEY]
+    old, new = tmp_path / "old.txt", tmp_path / "new.txt"
+    old.write_text("old")
+    new.write_text("new")
+    stale = time.time() - 3600
+    os.utime(old, (stale, stale))
+
+    assert service.sweep_uploads(max_age=60) == 1
+    assert not old.exists()
+    assert new.exists()
@@ -60,6 +60,28 @@ def test_generate_summary_chunk_text_runtime_error():
     assert response.data == expected_response.data
 
 
+def test_generate_summary_stream_error():
+    """Failures while reading or chunking streamed input give a 500 response."""
+
+    def windows():
+        yield "Some text. " * 10
+        raise OSError("Read failed")
+
+    model = MagicMock(spec=Model)
+    model.generate_response.return_value = "Summary"
+    response = SummaryGenerator(model).generate_summary(windows())
+
+    assert response.success is False
+    assert response.code == 500
+    assert response.message == "Read failed"
+    assert response.data is None
+
+    bad_strategy = SummaryGenerator(model, chunk_strategy="unknown")
+    response = bad_strategy.generate_summary(iter(["Some text."]))
+    assert response.code == 500
+    assert "Invalid chunk strategy" in response.message
+
+
 @pytest.fixture
 def mock_model_manager():
     mock_manager = MagicMock()